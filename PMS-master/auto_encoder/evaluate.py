@@ -0,0 +1,194 @@
+import time
+import numpy as np
+import pandas as pd
+from sklearn.metrics import roc_curve, precision_recall_curve, roc_auc_score, average_precision_score
+
+from model.registry import X_FILTER
+
+EVAL_BATCH_SIZE = 65536
+ANOMALY_THRESHOLD = 50.0  # anomaly_pipeline의 MAE 기준과 동일
+NORMAL_QUANTILES = (0.95, 0.99)
+RESULT_FILE = 'evaluation.npz'
+
+def score_dataset(engine, features, batch_size=EVAL_BATCH_SIZE):
+    """
+    특징 행렬 전체를 큰 배치로 나눠 NumPy 엔진으로 채점하고, 미리 할당한 배열에 행별 오차 기록
+
+    Parameters
+    ----------
+    engine : numpyAutoEncoder
+        Inference engine (auto_encoder.numpy_engine)
+    features : np.ndarray
+        Raw features of shape (N, n_features), ordered as X_FILTER
+    batch_size : int
+        Rows scored per call
+
+    Returns
+    -------
+    errors : dict
+        Per-row 'mae_original', 'mse_original', 'mse_scaled' arrays of shape (N,)
+    """
+    n_rows = len(features)
+    errors = {key: np.empty(n_rows, dtype=np.float64) for key in ('mae_original', 'mse_original', 'mse_scaled')}
+    for begin in range(0, n_rows, batch_size):
+        out = engine.score_errors(features[begin:begin + batch_size])
+        for key, arr in errors.items():
+            arr[begin:begin + batch_size] = out[key]
+    return errors
+
+def candidate_thresholds(score, is_anomaly, fixed=(ANOMALY_THRESHOLD,), quantiles=NORMAL_QUANTILES, roc=None, pr=None):
+    """
+    판정 임곗값 후보: 고정값, 정상 점수 분위수, F1 최대 임곗값, ROC Youden J 최대 임곗값
+
+    Parameters
+    ----------
+    score : np.ndarray
+        Per-row anomaly score (e.g., MAE)
+    is_anomaly : np.ndarray of bool
+        Ground-truth abnormal flag per row
+    fixed : tuple of float
+        Thresholds always evaluated
+    quantiles : tuple of float
+        Quantiles of the normal-row scores
+    roc, pr : tuple of np.ndarray, optional
+        Precomputed roc_curve / precision_recall_curve outputs (computed if None)
+
+    Returns
+    -------
+    thresholds : dict
+        Name -> threshold value
+    """
+    thresholds = {f'fixed_{value:g}': float(value) for value in fixed}
+    normal = score[~is_anomaly]
+    if len(normal):
+        for q in quantiles:
+            thresholds[f'normal_p{q * 100:g}'] = float(np.quantile(normal, q))
+    if 0 < is_anomaly.sum() < len(is_anomaly):
+        precision, recall, pr_thr = pr if pr is not None else precision_recall_curve(is_anomaly, score)
+        f1 = 2 * precision[:-1] * recall[:-1] / np.maximum(precision[:-1] + recall[:-1], 1e-12)
+        thresholds['best_f1'] = float(pr_thr[np.argmax(f1)])
+        fpr, tpr, roc_thr = roc if roc is not None else roc_curve(is_anomaly, score)
+        thresholds['youden_j'] = float(roc_thr[1:][np.argmax((tpr - fpr)[1:])])
+    return thresholds
+
+def detection_rates(score, targets, thresholds):
+    """
+    임곗값별로 클래스(target)마다 이상으로 판정된 비율 계산 (normal 행은 오탐률)
+
+    Parameters
+    ----------
+    score : np.ndarray
+        Per-row anomaly score
+    targets : array-like
+        Class label per row
+    thresholds : dict
+        Name -> threshold value
+
+    Returns
+    -------
+    rates : pandas.DataFrame
+        Rows: classes (with 'n' = row count), columns: threshold names
+    """
+    classes, codes = np.unique(np.asarray(targets), return_inverse=True)
+    counts = np.bincount(codes, minlength=len(classes))
+    rates = pd.DataFrame({'n': counts}, index=pd.Index(classes, name='target'))
+    for name, value in thresholds.items():
+        rates[name] = np.bincount(codes, weights=score >= value, minlength=len(classes)) / counts
+    return rates
+
+def evaluate(engine, test_df, batch_size=EVAL_BATCH_SIZE, thresholds=None):
+    """
+    평가 데이터 전체를 배치로 채점하고 ROC/PR 곡선, 임곗값 후보별 클래스 검출률 계산 (점수는 원 단위 MAE)
+
+    Parameters
+    ----------
+    engine : numpyAutoEncoder
+        Inference engine
+    test_df : pandas.DataFrame
+        Evaluation rows with X_FILTER, 'real_normal' and 'target' columns
+    batch_size : int
+        Rows scored per engine call
+    thresholds : dict, optional
+        Name -> threshold (default: candidate_thresholds)
+
+    Returns
+    -------
+    result : dict
+        'errors' (per-row arrays), 'is_anomaly', 'targets', 'roc', 'pr', 'summary', 'thresholds', 'rates'
+    """
+    start = time.perf_counter()
+    errors = score_dataset(engine, test_df[X_FILTER].to_numpy(dtype=np.float64), batch_size)
+    score_sec = time.perf_counter() - start
+
+    score = errors['mae_original']
+    is_anomaly = test_df['real_normal'].to_numpy() != 1
+    targets = test_df['target'].astype(str).to_numpy()
+    summary = {'n_rows': len(score), 'n_anomaly': int(is_anomaly.sum()), 'score_sec': score_sec,
+               'roc_auc': float('nan'), 'average_precision': float('nan')}
+    roc = pr = None
+    if 0 < is_anomaly.sum() < len(is_anomaly):
+        summary['roc_auc'] = float(roc_auc_score(is_anomaly, score))
+        summary['average_precision'] = float(average_precision_score(is_anomaly, score))
+        roc = roc_curve(is_anomaly, score)
+        pr = precision_recall_curve(is_anomaly, score)
+
+    if thresholds is None:
+        thresholds = candidate_thresholds(score, is_anomaly, roc=roc, pr=pr)
+    if roc is None:
+        roc = pr = (np.empty(0), np.empty(0), np.empty(0))
+    return {
+        'errors': errors,
+        'is_anomaly': is_anomaly,
+        'targets': targets,
+        'roc': roc,
+        'pr': pr,
+        'summary': summary,
+        'thresholds': thresholds,
+        'rates': detection_rates(score, targets, thresholds),
+    }
+
+def save_result(result, path=RESULT_FILE):
+    """
+    평가 결과를 하나의 압축 .npz로 저장 (행별 오차/라벨, ROC/PR 곡선, 임곗값, 클래스별 검출률, 요약)
+
+    Parameters
+    ----------
+    result : dict
+        Output of evaluate
+    path : str
+        Output path
+    """
+    classes, codes = np.unique(result['targets'], return_inverse=True)
+    rates = result['rates']
+    # 행별 값과 곡선은 float32로 줄여 저장 (임곗값/요약은 float64)
+    arrays = {key: value.astype(np.float32) for key, value in result['errors'].items()}
+    for name, curve in (('roc', ('fpr', 'tpr', 'threshold')), ('pr', ('precision', 'recall', 'threshold'))):
+        for key, value in zip(curve, result[name]):
+            arrays[f'{name}_{key}'] = np.asarray(value, dtype=np.float32)
+    arrays.update({
+        'is_anomaly': result['is_anomaly'],
+        'target_code': codes.astype(np.int16),
+        'classes': classes.astype(str),
+        'threshold_names': np.array(list(result['thresholds']), dtype=str),
+        'threshold_values': np.array(list(result['thresholds'].values()), dtype=np.float64),
+        'rate_classes': rates.index.to_numpy().astype(str),
+        'rate_counts': rates['n'].to_numpy(),
+        'rates': rates[list(result['thresholds'])].to_numpy(),
+        'summary_names': np.array(list(result['summary']), dtype=str),
+        'summary_values': np.array(list(result['summary'].values()), dtype=np.float64),
+    })
+    with open(path, 'wb') as f:
+        np.savez_compressed(f, **arrays)
+
+def format_summary(result):
+    """
+    평가 요약 문자열 (AUC와 임곗값 후보별 클래스 검출률 표)
+    """
+    summary = result['summary']
+    lines = [
+        f"[평가] {summary['n_rows']} rows (anomaly {summary['n_anomaly']}), scored in {summary['score_sec']:.2f}s, "
+        f"ROC-AUC {summary['roc_auc']:.4f}, AP {summary['average_precision']:.4f}",
+        "[평가] 임곗값: " + ", ".join(f"{name}={value:.4g}" for name, value in result['thresholds'].items()),
+        result['rates'].to_string(float_format=lambda v: f"{v:.3f}"),
+    ]
+    return "\n".join(lines)
@@ -0,0 +1,291 @@
+import copy
+import math
+import time
+import torch
+import torch.nn as nn
+import torch.optim as optim
+from torch.utils.data import DataLoader
+
+BASE_BATCH_SIZE = 8  # 기존 DataLoader 학습의 배치 크기 (LEARNING_RATE가 맞춰진 기준)
+FAST_BATCH_SIZE = 256
+WARMUP_EPOCHS = 5
+
+class earlyStopping:
+    """
+    검증 손실 기준 최적 가중치(best checkpoint)를 보관하고, patience epoch 동안 개선이 없으면 학습 중단을 알리는 클래스
+
+    Parameters
+    ----------
+    patience : int
+        Epochs without improvement before stopping
+    min_delta : float
+        Minimum decrease of the validation loss counted as improvement
+
+    Attributes
+    ----------
+    best_loss : float
+        Best validation loss so far
+    best_epoch : int
+        Epoch (1-based) of best_loss
+    stopped_epoch : int
+        Last epoch run (equals num_epochs if training was not stopped early)
+    best_state : dict
+        Copy of the model state_dict at best_epoch
+    """
+    def __init__(self, patience=10, min_delta=0.0):
+        self.patience = patience
+        self.min_delta = min_delta
+        self.best_loss = float('inf')
+        self.best_epoch = 0
+        self.stopped_epoch = 0
+        self.best_state = None
+
+    def step(self, model, epoch, val_loss):
+        """
+        epoch의 검증 손실을 반영하고, 중단해야 하면 True 반환
+        """
+        self.stopped_epoch = epoch
+        if val_loss < self.best_loss - self.min_delta:
+            self.best_loss = val_loss
+            self.best_epoch = epoch
+            self.best_state = copy.deepcopy(model.state_dict())
+        return epoch - self.best_epoch >= self.patience
+
+    def restore(self, model):
+        """
+        보관한 최적 가중치를 모델에 적용
+        """
+        if self.best_state is not None:
+            model.load_state_dict(self.best_state)
+
+    @property
+    def stopped_early(self):
+        return self.stopped_epoch - self.best_epoch >= self.patience
+
+def validation_loss(model, val_data, criterion):
+    """
+    검증 데이터 전체에 대한 재구성 손실 (eval 모드, 기울기 계산 없음)
+    """
+    model.eval()
+    with torch.no_grad():
+        _, outputs = model(val_data)
+        return criterion(outputs, val_data).item()
+
+def scaled_lr(base_lr, batch_size, base_batch_size=BASE_BATCH_SIZE):
+    """
+    배치 크기가 커진 만큼 학습률 보정 (Adam 계열은 제곱근 비율로 스케일)
+
+    Parameters
+    ----------
+    base_lr : float
+        Learning rate tuned for base_batch_size
+    batch_size : int
+        New batch size
+    base_batch_size : int
+        Batch size base_lr was tuned for
+
+    Returns
+    -------
+    lr : float
+        Peak learning rate for batch_size
+    """
+    return base_lr * math.sqrt(batch_size / base_batch_size)
+
+def lr_lambda(total_steps, warmup_steps):
+    """
+    선형 warmup 후 cosine decay(최종 5%)로 줄어드는 step 단위 학습률 배수 함수
+    """
+    def schedule(step):
+        if step < warmup_steps:
+            return (step + 1) / warmup_steps
+        progress = (step - warmup_steps) / max(total_steps - warmup_steps, 1)
+        return 0.05 + 0.95 * 0.5 * (1.0 + math.cos(math.pi * min(progress, 1.0)))
+    return schedule
+
+def train_in_memory(model, data, num_epochs, batch_size=FAST_BATCH_SIZE, base_lr=5e-3, base_batch_size=BASE_BATCH_SIZE,
+                    warmup_epochs=WARMUP_EPOCHS, device='cpu', seed=None, log=print, log_every=10, val_data=None, early_stopping=None):
+    """
+    스케일된 학습 데이터 전체를 하나의 텐서로 두고, epoch마다 permutation으로 섞어 큰 배치를 잘라 학습.
+    DataLoader/collate 오버헤드 없이 배치 크기에 맞춰 보정한 학습률(warmup + cosine)을 사용하며,
+    epoch별 손실, 소요 시간, 초당 샘플 수를 기록
+
+    Parameters
+    ----------
+    model : torch.nn.Module
+        AutoEncoder returning (latent, reconstruction)
+    data : array-like or torch.Tensor
+        Scaled training features of shape (N, input_dim)
+    num_epochs : int
+        Number of epochs
+    batch_size : int
+        Batch size sliced from the permutation
+    base_lr : float
+        Learning rate tuned for base_batch_size (scaled by scaled_lr)
+    base_batch_size : int
+        Batch size base_lr was tuned for
+    warmup_epochs : int
+        Epochs of linear learning-rate warmup
+    device : str or torch.device
+        Training device
+    seed : int, optional
+        Seed of the per-epoch permutations
+    log : callable or None
+        Progress logger (e.g., print)
+    log_every : int
+        Log every log_every epochs (and the first)
+    val_data : array-like or torch.Tensor, optional
+        Scaled validation features; adds 'val_loss' to every epoch
+    early_stopping : earlyStopping, optional
+        Tracks the best checkpoint on val_loss, stops after its patience and restores the best weights
+
+    Returns
+    -------
+    history : list of dict
+        Per-epoch 'epoch', 'loss', 'lr', 'epoch_time', 'samples_per_sec' (and 'val_loss')
+    """
+    data = torch.as_tensor(data, dtype=torch.float32).to(device)
+    if val_data is not None:
+        val_data = torch.as_tensor(val_data, dtype=torch.float32).to(device)
+    n_samples = len(data)
+    steps_per_epoch = math.ceil(n_samples / batch_size)
+    total_steps = steps_per_epoch * num_epochs
+    warmup_steps = min(warmup_epochs * steps_per_epoch, max(total_steps - 1, 1))
+
+    model.to(device)
+    criterion = nn.MSELoss()
+    optimizer = optim.Adam(model.parameters(), lr=scaled_lr(base_lr, batch_size, base_batch_size))
+    scheduler = optim.lr_scheduler.LambdaLR(optimizer, lr_lambda(total_steps, warmup_steps))
+    generator = torch.Generator()
+    if seed is not None:
+        generator.manual_seed(seed)
+
+    history = []
+    for epoch in range(num_epochs):
+        model.train()
+        start = time.perf_counter()
+        perm = torch.randperm(n_samples, generator=generator).to(device)
+        epoch_loss = torch.zeros((), device=device)
+        for begin in range(0, n_samples, batch_size):
+            batch = data[perm[begin:begin + batch_size]]
+            _, outputs = model(batch)
+            loss = criterion(outputs, batch)
+
+            optimizer.zero_grad(set_to_none=True)
+            loss.backward()
+            optimizer.step()
+            scheduler.step()
+
+            epoch_loss += loss.detach() * len(batch)
+
+        loss_value = epoch_loss.item() / n_samples
+        epoch_time = time.perf_counter() - start
+        history.append({
+            'epoch': epoch + 1,
+            'loss': loss_value,
+            'lr': optimizer.param_groups[0]['lr'],
+            'epoch_time': epoch_time,
+            'samples_per_sec': n_samples / epoch_time if epoch_time > 0 else float('inf'),
+        })
+        if _end_of_epoch(model, history, val_data, criterion, early_stopping, log, log_every, num_epochs):
+            break
+    if early_stopping is not None:
+        early_stopping.restore(model)
+    return history
+
+def train_dataloader(model, data, num_epochs, batch_size=BASE_BATCH_SIZE, lr=5e-3, device='cpu', log=print, log_every=10, val_data=None, early_stopping=None):
+    """
+    기존 방식(DataLoader, 작은 배치, 고정 학습률) 학습. train_in_memory와 같은 형식으로 epoch 시간/처리량을 기록해 비교에 사용
+
+    Parameters
+    ----------
+    model : torch.nn.Module
+        AutoEncoder returning (latent, reconstruction)
+    data : array-like or torch.Tensor
+        Scaled training features of shape (N, input_dim)
+    num_epochs : int
+        Number of epochs
+    batch_size : int
+        DataLoader batch size
+    lr : float
+        Adam learning rate
+    device : str or torch.device
+        Training device
+    log : callable or None
+        Progress logger
+    log_every : int
+        Log every log_every epochs (and the first)
+    val_data : array-like or torch.Tensor, optional
+        Scaled validation features; adds 'val_loss' to every epoch
+    early_stopping : earlyStopping, optional
+        Tracks the best checkpoint on val_loss, stops after its patience and restores the best weights
+
+    Returns
+    -------
+    history : list of dict
+        Per-epoch 'epoch', 'loss', 'lr', 'epoch_time', 'samples_per_sec' (and 'val_loss')
+    """
+    dataset = torch.as_tensor(data, dtype=torch.float32)
+    if val_data is not None:
+        val_data = torch.as_tensor(val_data, dtype=torch.float32).to(device)
+    train_loader = DataLoader(dataset, batch_size=batch_size, shuffle=True, num_workers=0, drop_last=False)
+
+    model.to(device)
+    criterion = nn.MSELoss()
+    optimizer = optim.Adam(model.parameters(), lr=lr)
+
+    history = []
+    for epoch in range(num_epochs):
+        model.train()
+        start = time.perf_counter()
+        epoch_loss = 0.0
+        for batch in train_loader:
+            batch = batch.to(device)
+            _, outputs = model(batch)
+            loss = criterion(outputs, batch)
+            optimizer.zero_grad(); loss.backward(); optimizer.step()
+            epoch_loss += loss.item() * batch.size(0)
+
+        epoch_time = time.perf_counter() - start
+        history.append({
+            'epoch': epoch + 1,
+            'loss': epoch_loss / len(dataset),
+            'lr': lr,
+            'epoch_time': epoch_time,
+            'samples_per_sec': len(dataset) / epoch_time if epoch_time > 0 else float('inf'),
+        })
+        if _end_of_epoch(model, history, val_data, criterion, early_stopping, log, log_every, num_epochs):
+            break
+    if early_stopping is not None:
+        early_stopping.restore(model)
+    return history
+
+def _end_of_epoch(model, history, val_data, criterion, early_stopping, log, log_every, num_epochs):
+    record = history[-1]
+    stop = False
+    if val_data is not None:
+        record['val_loss'] = validation_loss(model, val_data, criterion)
+        if early_stopping is not None:
+            stop = early_stopping.step(model, record['epoch'], record['val_loss'])
+    if log is not None and (record['epoch'] % log_every == 0 or record['epoch'] == 1 or stop):
+        log(format_epoch(record, num_epochs))
+    return stop
+
+def format_epoch(record, num_epochs):
+    """
+    epoch 기록 한 줄 요약 문자열
+    """
+    val = f", Val Loss: {record['val_loss']:.6f}" if 'val_loss' in record else ""
+    return (f"Epoch [{record['epoch']}/{num_epochs}], Train Loss: {record['loss']:.6f}{val}, "
+            f"{record['epoch_time'] * 1000:.1f} ms/epoch, {record['samples_per_sec']:.0f} samples/s")
+
+def summarize_history(history):
+    """
+    학습 전체의 평균 epoch 시간과 처리량 요약 문자열 (DataLoader 학습과의 비교용)
+    """
+    if not history:
+        return "[학습] epoch 없음"
+    total = sum(record['epoch_time'] for record in history)
+    samples = sum(record['samples_per_sec'] * record['epoch_time'] for record in history)
+    return (f"[학습] {len(history)} epochs, total {total:.2f}s, "
+            f"mean {total / len(history) * 1000:.1f} ms/epoch, {samples / total if total > 0 else float('inf'):.0f} samples/s, "
+            f"final loss {history[-1]['loss']:.6f}")
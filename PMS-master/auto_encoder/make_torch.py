@@ -2,17 +2,7 @@ import torch
 from tqdm import tqdm
 from sklearn.preprocessing import StandardScaler
 
-X_FILTER = [
-    'time_rms', 'time_skewness', 'time_kurtosis', 'time_crest_factor',
-    'time_shape_factor', 'time_mean', 'time_std', 'time_peak',
-    'time_mean_diff', 'time_std_diff', 'time_min_diff', 'time_max_diff',
-    'fft_centroid', 'fft_bandwidth', 'fft_peak_freq', 'fft_over_env',
-    'fft_amp_1x', 'fft_amp_2x', 'fft_amp_3x', 'fft_amp_4x', 'fft_amp_5x',
-    'cD1_rms', 'cD1_kurtosis', 'cD2_rms', 'cD2_kurtosis', 
-    'cD3_rms', 'cD3_kurtosis', 'cD4_rms', 'cD4_kurtosis', 
-    'cD5_rms', 'cD5_kurtosis', 'cD6_rms', 'cD6_kurtosis', 
-    'cD7_rms', 'cD7_kurtosis'
-]
+from model.registry import X_FILTER
 
 class stdScaling:
     """
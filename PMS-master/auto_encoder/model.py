@@ -62,4 +62,26 @@ class AutoEncoder(nn.Module):
         """
         latent_vec = self.encoder(x)
         out = self.decoder(latent_vec)
-        return latent_vec, out
\ No newline at end of file
+        return latent_vec, out
+
+
+def autoencoder_from_state(state_dict):
+    """
+    저장된 state_dict의 가중치 shape에서 input/hidden/latent 차원을 읽어 같은 구조의 AutoEncoder를 만들고 가중치 적용
+    (탐색으로 고른 차원이 기본값과 달라도 로드 가능)
+
+    Parameters
+    ----------
+    state_dict : dict
+        AutoEncoder state_dict
+
+    Returns
+    -------
+    model : AutoEncoder
+        Model with the weights loaded
+    """
+    hidden_dim, input_dim = state_dict['encoder.0.weight'].shape
+    latent_dim = state_dict['encoder.6.weight'].shape[0]
+    model = AutoEncoder(input_dim, hidden_dim, latent_dim)
+    model.load_state_dict(state_dict)
+    return model
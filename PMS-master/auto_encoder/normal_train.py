@@ -1,28 +1,17 @@
 import torch
-import torch.nn as nn
-import torch.optim as optim
 from joblib import dump
-from torch.utils.data import random_split, DataLoader
 
 from auto_encoder.make_torch import stdScaling, df2torch
-from model.load_and_arange import loadArange
-from model.preprocess import preProcess
-from model.split import split_data
+from model.feature_cache import featureCache
+from model.feature_store import DATASET_DIR, build_feature_dataset
+from model.split import split_dataset
+from model.registry import X_FILTER
 from auto_encoder.model import AutoEncoder
+from auto_encoder.fast_train import train_in_memory, train_dataloader, summarize_history
+from auto_encoder.numpy_engine import ENGINE_FILE, export_npz, source_hash
 
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
-X_FILTER = [
-    'time_rms', 'time_skewness', 'time_kurtosis', 'time_crest_factor',
-    'time_shape_factor', 'time_mean', 'time_std', 'time_peak',
-    'time_mean_diff', 'time_std_diff', 'time_min_diff', 'time_max_diff',
-    'fft_centroid', 'fft_bandwidth', 'fft_peak_freq', 'fft_over_env',
-    'fft_amp_1x', 'fft_amp_2x', 'fft_amp_3x', 'fft_amp_4x', 'fft_amp_5x',
-    'cD1_rms', 'cD1_kurtosis', 'cD2_rms', 'cD2_kurtosis', 
-    'cD3_rms', 'cD3_kurtosis', 'cD4_rms', 'cD4_kurtosis', 
-    'cD5_rms', 'cD5_kurtosis', 'cD6_rms', 'cD6_kurtosis', 
-    'cD7_rms', 'cD7_kurtosis'
-]
 Y_FILTER = ['real_normal']
 
 # 🔧 하이퍼파라미터
@@ -32,6 +21,8 @@ hidden_dim = 32
 batch_size = 8
 num_epochs = 100
 learning_rate = 5e-3
+train_mode = 'loader'  # 'loader': 기존 DataLoader 학습, 'tensor': 메모리 내 텐서 + 큰 배치 (비교용, fast_train 참고)
+fast_batch_size = 256
 
 if __name__ == "__main__":
     """
@@ -42,11 +33,13 @@ if __name__ == "__main__":
     - 시계열 신호로부터 통계/주파수/웨이블릿 특징 추출
     - 라벨 분리 및 정상 데이터 선택
     - feature scaling 및 torch tensor 변환
-    - AutoEncoder 학습 및 모델 저장
+    - AutoEncoder 학습 및 모델 저장 (NumPy 추론 엔진 .npz 포함)
     """
-    df = loadArange().load_arange()
-    df = preProcess(df).preprocess()
-    train_df, test_df = split_data(df)
+    cache = featureCache('feature_cache.sqlite')
+    if build_feature_dataset(DATASET_DIR, cache=cache):
+        print(cache.summary())
+    # 정상 파티션(real_normal==1)의 X_FILTER 컬럼만 읽음
+    train_df, _ = split_dataset(DATASET_DIR, train_columns=X_FILTER, test_columns=[])
     df = train_df.copy()
 
     # Data Scaling
@@ -56,29 +49,16 @@ if __name__ == "__main__":
 
     dataset = df2torch(df[X_FILTER])
 
-    train_loader = DataLoader(dataset, batch_size=batch_size, shuffle=True, num_workers=4, pin_memory=True)
-
     model = AutoEncoder(input_dim, hidden_dim, latent_dim).to(device)
-    criterion = nn.MSELoss()
-    optimizer = optim.Adam(model.parameters(), lr=learning_rate)
-
-    for epoch in range(num_epochs):
-        model.train()
-        train_loss = 0.0
-        for batch in train_loader:
-            batch = batch.to(device)
-            _, outputs = model(batch)
-            loss = criterion(outputs, batch)
-
-            optimizer.zero_grad()
-            loss.backward()
-            optimizer.step()
-
-            train_loss += loss.item() * batch.size(0)
-
-        train_loss /= len(train_loader.dataset)
-        print(f"Epoch [{epoch+1}/{num_epochs}], Train Loss: {train_loss:.6f}")
+    if train_mode == 'tensor':
+        # 전체 데이터를 하나의 텐서로 두고 큰 배치 + 보정 학습률로 학습
+        history = train_in_memory(model, dataset, num_epochs, batch_size=fast_batch_size, base_lr=learning_rate, base_batch_size=batch_size, device=device, log_every=1)
+    else:
+        history = train_dataloader(model, dataset, num_epochs, batch_size=batch_size, lr=learning_rate, device=device, log_every=1)
+    print(summarize_history(history))
 
     model_cpu = model.cpu()
     torch.save(model_cpu.state_dict(), 'normal_train.model')
+    # 추론(anomaly_pipeline / server)은 torch 없이 이 .npz만 사용
+    export_npz(model_cpu, scaler, ENGINE_FILE, X_FILTER, source=source_hash('normal_train.model', 'scaler.joblib'))
     print("학습종료")
\ No newline at end of file
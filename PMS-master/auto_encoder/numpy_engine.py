@@ -0,0 +1,273 @@
+import sys
+import hashlib
+import numpy as np
+
+# torch 없이 추론하기 위한 모듈: 모듈 수준에서 torch/sklearn을 import하지 않음 (export_npz만 torch 객체를 받음)
+
+ENGINE_FILE = 'autoencoder.npz'
+ENGINE_VERSION = 1
+
+def _layer_spec(sequential, prefix):
+    spec = []
+    for idx, layer in enumerate(sequential):
+        kind = type(layer).__name__
+        if kind == 'Linear':
+            spec.append(f'linear:{prefix}.{idx}')
+        elif kind == 'LayerNorm':
+            spec.append(f'layernorm:{prefix}.{idx}:{layer.eps}')
+        elif kind == 'ReLU':
+            spec.append('relu')
+        else:
+            raise ValueError(f"지원하지 않는 레이어입니다: {kind}")
+    return spec
+
+def source_hash(*paths):
+    """
+    모델/스케일러 파일 내용의 blake2b 해시. 엔진이 어떤 아티팩트에서 변환됐는지 기록해
+    mtime(체크아웃 순서에 따라 달라짐) 대신 내용으로 최신 여부를 판단
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+def read_source_hash(path):
+    """
+    엔진 .npz에 기록된 source_hash (없으면 None). 가중치는 읽지 않음
+    """
+    with np.load(path, allow_pickle=False) as data:
+        return str(data['source_hash']) if 'source_hash' in data.files else None
+
+def export_npz(model, scaler, path, columns=None, source=None):
+    """
+    학습된 AutoEncoder 가중치(Linear, LayerNorm)와 스케일러 평균/표준편차를 하나의 .npz로 저장
+
+    Parameters
+    ----------
+    model : AutoEncoder
+        Trained torch model (encoder/decoder nn.Sequential of Linear, LayerNorm, ReLU)
+    scaler : stdScaling or sklearn.preprocessing.StandardScaler
+        Fitted scaler (mean_ and scale_ are stored)
+    path : str or Path
+        Output .npz path
+    columns : list of str, optional
+        Feature column order (stored for validation)
+    source : str, optional
+        source_hash of the model/scaler files the engine is converted from
+    """
+    std = getattr(scaler, 'scaler', scaler)
+    state = {key: value.detach().cpu().numpy().astype(np.float32) for key, value in model.state_dict().items()}
+    arrays = {f'param/{key}': value for key, value in state.items()}
+    arrays['encoder_spec'] = np.array(_layer_spec(model.encoder, 'encoder'))
+    arrays['decoder_spec'] = np.array(_layer_spec(model.decoder, 'decoder'))
+    arrays['scaler_mean'] = np.asarray(std.mean_, dtype=np.float64)
+    arrays['scaler_scale'] = np.asarray(std.scale_, dtype=np.float64)
+    arrays['version'] = np.array(ENGINE_VERSION)
+    if columns is not None:
+        arrays['columns'] = np.array(list(columns))
+    if source is not None:
+        arrays['source_hash'] = np.array(source)
+    # np.savez는 확장자를 붙이므로 파일 객체로 저장해 경로를 그대로 사용
+    with open(path, 'wb') as f:
+        np.savez(f, **arrays)
+
+class numpyAutoEncoder:
+    """
+    export_npz로 저장한 .npz만으로 AutoEncoder 순전파(Linear -> LayerNorm -> ReLU)를 NumPy로 수행하는 추론 엔진.
+    torch/sklearn/joblib 없이 run_autoencoder_inference와 같은 결과를 계산
+
+    Parameters
+    ----------
+    path : str or Path
+        .npz artifact written by export_npz
+
+    Attributes
+    ----------
+    mean, scale : np.ndarray
+        Scaler statistics of shape (n_features,)
+    columns : list of str or None
+        Feature column order the model was trained with
+    fused_encoder, fused_decoder : list of tuple
+        Layers with the scaler folded into the first and last Linear (see score_errors)
+    """
+    def __init__(self, path):
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['version']) != ENGINE_VERSION:
+                raise ValueError(f"지원하지 않는 엔진 버전입니다: {int(data['version'])}")
+            params = {key[len('param/'):]: data[key] for key in data.files if key.startswith('param/')}
+            self.encoder = self._build(data['encoder_spec'], params)
+            self.decoder = self._build(data['decoder_spec'], params)
+            self.mean = data['scaler_mean']
+            self.scale = data['scaler_scale']
+            self.columns = [str(col) for col in data['columns']] if 'columns' in data.files else None
+        self.inv_scale = 1.0 / self.scale
+        self.fused_encoder, self.fused_decoder = self._fold()
+
+    def _fold(self):
+        """
+        표준화((x - mean) / scale)를 첫 Linear에, 역변환(y * scale + mean)을 마지막 Linear에 접어 넣은 레이어 생성.
+        평균을 빼는 항이 bias로 옮겨지므로 원 단위 값의 자릿수 손실을 피하도록 float64로 보관
+        (레이어 전체를 float64로 두어 호출마다 dtype 변환이 일어나지 않게 함)
+        """
+        def as64(layers):
+            return [tuple(np.asarray(p, dtype=np.float64) if isinstance(p, np.ndarray) else p for p in layer) for layer in layers]
+
+        encoder, decoder = as64(self.encoder), as64(self.decoder)
+        kind, weight, bias = encoder[0]
+        encoder[0] = (kind, weight * self.inv_scale[:, None], bias - (self.mean * self.inv_scale) @ weight)
+        kind, weight, bias = decoder[-1]
+        decoder[-1] = (kind, weight * self.scale, bias * self.scale + self.mean)
+        return encoder, decoder
+
+    @staticmethod
+    def _build(spec, params):
+        layers = []
+        for item in spec:
+            kind, *args = str(item).split(':')
+            if kind == 'linear':
+                # x @ W.T + b 를 x @ W_t + b 로 계산하도록 전치해 둠
+                layers.append(('linear', np.ascontiguousarray(params[f'{args[0]}.weight'].T), params[f'{args[0]}.bias']))
+            elif kind == 'layernorm':
+                layers.append(('layernorm', params[f'{args[0]}.weight'], params[f'{args[0]}.bias'], np.float32(args[1])))
+            else:
+                layers.append(('relu',))
+        return layers
+
+    @staticmethod
+    def _run(layers, x):
+        # 한 행 추론은 연산 수(호출 오버헤드)가 시간을 좌우하므로 np.mean 대신 sum / n을 쓰고,
+        # 첫 Linear가 만든 배열을 제자리 연산으로 재사용 (입력 배열은 수정하지 않음)
+        for layer in layers:
+            if layer[0] == 'linear':
+                x = x @ layer[1]
+                x += layer[2]
+            elif layer[0] == 'layernorm':
+                inv_n = 1.0 / x.shape[-1]
+                x = x - x.sum(axis=-1, keepdims=True) * inv_n
+                var = (x * x).sum(axis=-1, keepdims=True) * inv_n
+                x /= np.sqrt(var + layer[3])
+                x *= layer[1]
+                x += layer[2]
+            else:
+                x = np.maximum(x, 0)
+        return x
+
+    def forward(self, scaled):
+        """
+        스케일된 입력에 대한 순전파
+
+        Parameters
+        ----------
+        scaled : np.ndarray
+            Scaled features of shape (n_features,) or (batch, n_features)
+
+        Returns
+        -------
+        latent : np.ndarray
+            Latent vectors of shape (batch, latent_dim)
+        recon : np.ndarray
+            Scaled reconstructions of shape (batch, n_features)
+        """
+        x = np.atleast_2d(np.asarray(scaled, dtype=np.float32))
+        latent = self._run(self.encoder, x)
+        return latent, self._run(self.decoder, latent)
+
+    def score(self, features):
+        """
+        원 단위 특징 벡터(또는 배치)를 스케일링 후 복원하여 run_autoencoder_inference와 같은 오차 항목 계산
+
+        Parameters
+        ----------
+        features : np.ndarray
+            Raw features of shape (n_features,) or (batch, n_features), ordered as columns
+
+        Returns
+        -------
+        result : dict
+            Per-row arrays: scaled_input, scaled_reconstruction, original_input, original_reconstruction,
+            latent_vector, mse_scaled, mse_original, mae_original
+        """
+        original = np.atleast_2d(np.asarray(features, dtype=np.float64))
+        scaled = ((original - self.mean) / self.scale).astype(np.float32)
+        latent, recon = self.forward(scaled)
+        original_recon = recon.astype(np.float64) * self.scale + self.mean
+        original_diff = original - original_recon
+        return {
+            'scaled_input': scaled,
+            'scaled_reconstruction': recon,
+            'original_input': original,
+            'original_reconstruction': original_recon,
+            'latent_vector': latent,
+            'mse_scaled': np.mean((scaled - recon)**2, axis=1),
+            'mse_original': np.mean(original_diff**2, axis=1),
+            'mae_original': np.mean(np.abs(original_diff), axis=1),
+        }
+
+    def score_errors(self, features):
+        """
+        스케일러를 접어 넣은 레이어로 원 단위 특징에서 바로 오차와 잠재 벡터를 계산 (실시간 추론 경로).
+        스케일된 오차는 (x - x_hat) / scale 과 같으므로 스케일링/역변환 배열을 따로 만들지 않음
+
+        Parameters
+        ----------
+        features : np.ndarray
+            Raw features of shape (n_features,) or (batch, n_features), ordered as columns
+
+        Returns
+        -------
+        result : dict
+            Per-row arrays: mae_original, mse_original, mse_scaled, latent_vector
+        """
+        original = np.atleast_2d(np.asarray(features, dtype=np.float64))
+        latent = self._run(self.fused_encoder, original)
+        diff = original - self._run(self.fused_decoder, latent)
+        scaled_diff = diff * self.inv_scale
+        inv_n = 1.0 / diff.shape[1]
+        return {
+            'mae_original': np.abs(diff).sum(axis=1) * inv_n,
+            'mse_original': (diff * diff).sum(axis=1) * inv_n,
+            'mse_scaled': (scaled_diff * scaled_diff).sum(axis=1) * inv_n,
+            'latent_vector': latent.astype(np.float32),
+        }
+
+def compare_with_torch(engine, model, scaled):
+    """
+    같은 스케일된 입력에 대해 NumPy 엔진과 torch 모델의 잠재 벡터/복원값 최대 절대오차 비교
+
+    Returns
+    -------
+    latent_err, recon_err : float
+        Max absolute differences
+    """
+    import torch
+
+    model.eval()
+    with torch.no_grad():
+        latent_t, recon_t = model(torch.as_tensor(np.atleast_2d(scaled), dtype=torch.float32))
+    latent_n, recon_n = engine.forward(scaled)
+    return float(np.max(np.abs(latent_t.numpy() - latent_n))), float(np.max(np.abs(recon_t.numpy() - recon_n)))
+
+if __name__ == "__main__":
+    """
+    저장된 torch 모델/스케일러를 .npz 엔진 아티팩트로 변환하고 torch 결과와의 오차 확인
+    사용법: python -m auto_encoder.numpy_engine [모델 경로] [스케일러 경로] [출력 .npz 경로]
+    """
+    import joblib
+    import torch
+    from auto_encoder.model import autoencoder_from_state
+    from model.registry import X_FILTER
+
+    model_path = sys.argv[1] if len(sys.argv) > 1 else 'normal_train.model'
+    scaler_path = sys.argv[2] if len(sys.argv) > 2 else 'scaler.joblib'
+    out_path = sys.argv[3] if len(sys.argv) > 3 else ENGINE_FILE
+
+    model = autoencoder_from_state(torch.load(model_path, map_location='cpu'))
+    scaler = joblib.load(scaler_path)
+    export_npz(model, scaler, out_path, X_FILTER, source=source_hash(model_path, scaler_path))
+
+    engine = numpyAutoEncoder(out_path)
+    sample = np.random.default_rng(0).standard_normal((1024, len(X_FILTER))).astype(np.float32)
+    latent_err, recon_err = compare_with_torch(engine, model, sample)
+    print(f"[numpy-engine] {out_path} 저장, max |Δlatent|={latent_err:.3e}, max |Δrecon|={recon_err:.3e}")
@@ -0,0 +1,73 @@
+import sys
+import torch
+import joblib
+import numpy as np
+import pandas as pd
+
+from auto_encoder.make_torch import X_FILTER, df2torch
+from auto_encoder.model import AutoEncoder
+from model.load_and_arange import loadArange
+from model.precision import compare_precision
+
+# 🔧 하이퍼파라미터 (학습 시와 동일)
+input_dim = len(X_FILTER)
+latent_dim = 8
+hidden_dim = 32
+anomaly_threshold = 50.0
+sample_size = 256
+
+def reconstruction_mae(model, scaler, features):
+    """
+    특징 DataFrame을 스케일링 후 AutoEncoder로 복원하고, 원 단위 기준 행별 MAE 계산 (파이프라인의 mae_original과 동일)
+
+    Parameters
+    ----------
+    model : AutoEncoder
+        Trained AutoEncoder in eval mode
+    scaler : stdScaling
+        Fitted scaler wrapper
+    features : pandas.DataFrame
+        Feature dataframe containing X_FILTER columns
+
+    Returns
+    -------
+    mae : np.ndarray
+        Per-row mean absolute reconstruction error in original units
+    """
+    scaled = pd.DataFrame(scaler.scaling(features[X_FILTER]), columns=X_FILTER)
+    with torch.no_grad():
+        _, recon = model(df2torch(scaled))
+    original_input = features[X_FILTER].to_numpy()
+    original_recon = scaler.scaler.inverse_transform(recon.numpy())
+    return np.mean(np.abs(original_input - original_recon), axis=1)
+
+if __name__ == "__main__":
+    """
+    float32 연산 모드 적용 전 안전성 확인용 리포트
+    - 표본 구간에 대해 float64/float32 특징을 모두 계산하여 X_FILTER 특징별 최대 상대오차 출력
+    - 저장된 AutoEncoder/스케일러로 두 정밀도의 MAE 차이 및 이상 판정 일치율 출력
+    """
+    if len(sys.argv) > 1:
+        sample_size = int(sys.argv[1])
+
+    df = loadArange().load_arange()
+    windows = np.stack(df['dt_arr'].to_numpy())
+    report, features64, features32 = compare_precision(windows, X_FILTER, sample_size=sample_size)
+
+    pd.set_option('display.width', 200)
+    print("[float32 리포트] 특징별 오차 (표본 {}개 구간)".format(len(features64)))
+    print(report.sort_values('max_rel_err', ascending=False).to_string(float_format=lambda v: f"{v:.3e}"))
+
+    scaler = joblib.load('scaler.joblib')
+    model = AutoEncoder(input_dim, hidden_dim, latent_dim)
+    model.load_state_dict(torch.load('normal_train.model', map_location='cpu'))
+    model.eval()
+
+    mae64 = reconstruction_mae(model, scaler, features64)
+    mae32 = reconstruction_mae(model, scaler, features32)
+    mae_abs_err = np.abs(mae32 - mae64)
+    agreement = np.mean((mae64 >= anomaly_threshold) == (mae32 >= anomaly_threshold))
+
+    print("\n[float32 리포트] AutoEncoder MAE 영향")
+    print(f"  max |ΔMAE| = {mae_abs_err.max():.6e}, max rel ΔMAE = {(mae_abs_err / np.maximum(mae64, 1e-12)).max():.6e}")
+    print(f"  이상 판정 일치율(threshold={anomaly_threshold}) = {agreement*100:.2f}%")
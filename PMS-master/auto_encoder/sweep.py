@@ -0,0 +1,193 @@
+import os
+import sys
+import json
+import time
+import itertools
+import numpy as np
+import pandas as pd
+import torch
+import torch.nn as nn
+from joblib import dump
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from sklearn.metrics import roc_auc_score
+
+from auto_encoder.make_torch import stdScaling
+from auto_encoder.model import AutoEncoder, autoencoder_from_state
+from auto_encoder.numpy_engine import ENGINE_FILE, export_npz, source_hash
+from auto_encoder.fast_train import train_in_memory, earlyStopping, validation_loss
+from model.feature_store import DATASET_DIR
+from model.split import split_dataset
+from model.registry import X_FILTER, LABEL_COLUMNS
+
+# 🔧 탐색 공간 (기본값: normal_train.py / anomaly_pipeline.py의 하이퍼파라미터 포함)
+SEARCH_SPACE = {
+    'hidden_dim': [16, 32, 64],
+    'latent_dim': [4, 8, 12],
+    'batch_size': [64, 256],
+    'learning_rate': [1e-3, 5e-3, 1e-2],
+}
+num_epochs = 100
+patience = 10
+val_fraction = 0.2
+threads_per_worker = 1
+seed = 42
+
+_DATA = {}
+
+def sweep_configs(space=SEARCH_SPACE, n_samples=None, seed=seed):
+    """
+    탐색 공간의 전체 격자, 또는 n_samples개 무작위 표본 설정 목록 생성
+
+    Parameters
+    ----------
+    space : dict
+        Hyperparameter name -> candidate values
+    n_samples : int, optional
+        Number of configurations sampled from the grid (all if None)
+    seed : int
+        Random seed of the sample
+
+    Returns
+    -------
+    configs : list of dict
+        One dict per configuration
+    """
+    keys = list(space)
+    grid = [dict(zip(keys, values)) for values in itertools.product(*(space[key] for key in keys))]
+    if n_samples is not None and n_samples < len(grid):
+        idx = np.random.default_rng(seed).choice(len(grid), size=n_samples, replace=False)
+        grid = [grid[i] for i in sorted(idx)]
+    return grid
+
+def _init_worker(data, threads):
+    # 워커마다 torch 스레드 수를 제한해 프로세스 수 x 스레드 수가 코어 수를 넘지 않도록 함
+    torch.set_num_threads(threads)
+    _DATA.update(data)
+
+def _train_config(config):
+    """
+    워커에서 설정 하나를 학습하고 검증 재구성 오차와 정상/이상 분리도 계산
+    """
+    torch.manual_seed(seed)
+    start = time.perf_counter()
+    model = AutoEncoder(_DATA['train'].shape[1], config['hidden_dim'], config['latent_dim'])
+    stopper = earlyStopping(patience=_DATA['patience'])
+    train_in_memory(
+        model, _DATA['train'], _DATA['num_epochs'], batch_size=config['batch_size'], base_lr=config['learning_rate'],
+        base_batch_size=config['batch_size'], seed=seed, log=None, val_data=_DATA['val'], early_stopping=stopper,
+    )
+
+    # 이상 판정과 같은 원 단위 MAE로 평가 (test 분할은 normal_test의 최종 평가와 같으므로 참고용, 순위에는 사용하지 않음)
+    model.eval()
+    with torch.no_grad():
+        _, recon = model(torch.as_tensor(_DATA['test'], dtype=torch.float32))
+    recon = recon.numpy() * _DATA['scale'] + _DATA['mean']
+    mae = np.mean(np.abs(_DATA['test_original'] - recon), axis=1)
+    is_anomaly = _DATA['test_anomaly']
+    normal_mae, anomaly_mae = mae[~is_anomaly], mae[is_anomaly]
+
+    result = dict(config)
+    result.update({
+        'val_mse': validation_loss(model, torch.as_tensor(_DATA['val'], dtype=torch.float32), nn.MSELoss()),
+        'roc_auc': roc_auc_score(is_anomaly, mae) if 0 < is_anomaly.sum() < len(is_anomaly) else float('nan'),
+        # 이상 MAE 중앙값 / 정상 MAE 95 분위수 (1보다 클수록 임곗값으로 나누기 쉬움)
+        'separation': float(np.median(anomaly_mae) / np.percentile(normal_mae, 95)) if len(normal_mae) and len(anomaly_mae) else float('nan'),
+        'normal_mae_p95': float(np.percentile(normal_mae, 95)) if len(normal_mae) else float('nan'),
+        'anomaly_mae_median': float(np.median(anomaly_mae)) if len(anomaly_mae) else float('nan'),
+        'best_epoch': stopper.best_epoch,
+        'stop_epoch': stopper.stopped_epoch,
+        'train_sec': time.perf_counter() - start,
+    })
+    return result, {k: v.cpu() for k, v in model.state_dict().items()}
+
+def run_sweep(configs, train_df, test_df, workers=None, threads=threads_per_worker, out_dir='sweep'):
+    """
+    설정들을 프로세스 풀에서 병렬로 학습하고, 리더보드(leaderboard.csv)와 1위 설정의 모델/스케일러/설정을 out_dir에 저장
+
+    Parameters
+    ----------
+    configs : list of dict
+        Configurations (see sweep_configs)
+    train_df : pandas.DataFrame
+        Normal training rows with X_FILTER columns
+    test_df : pandas.DataFrame
+        Held-out normal + abnormal rows with X_FILTER and 'real_normal' columns
+    workers : int or None
+        Number of worker processes (None: cores // threads)
+    threads : int
+        torch threads per worker
+    out_dir : str
+        Output directory
+
+    Returns
+    -------
+    leaderboard : pandas.DataFrame
+        One row per configuration, best first by val_mse (normal-only validation split carved from train_df).
+        roc_auc/separation are computed on test_df for reference only: test_df is the held-out split
+        normal_test reports on, so ranking on it would bias the final metrics
+    """
+    perm = np.random.default_rng(seed).permutation(len(train_df))
+    n_val = max(int(len(train_df) * val_fraction), 1)
+    fit_df = train_df.iloc[np.sort(perm[n_val:])]
+    val_df = train_df.iloc[np.sort(perm[:n_val])]
+
+    # 스케일러는 한 번만 학습해 모든 설정이 같은 입력을 사용
+    scaler = stdScaling(fit_df)
+    data = {
+        'train': scaler.scaling(fit_df).astype(np.float32),
+        'val': scaler.scaling(val_df).astype(np.float32),
+        'test': scaler.scaling(test_df).astype(np.float32),
+        'test_original': test_df[X_FILTER].to_numpy(dtype=np.float64),
+        'test_anomaly': test_df['real_normal'].to_numpy() != 1,
+        'mean': scaler.scaler.mean_,
+        'scale': scaler.scaler.scale_,
+        # spawn 워커는 모듈 전역값 변경을 보지 못하므로 학습 설정도 함께 전달
+        'num_epochs': num_epochs,
+        'patience': patience,
+    }
+
+    if workers is None:
+        workers = max((os.cpu_count() or 1) // threads, 1)
+    start = time.perf_counter()
+    if workers == 1:
+        _init_worker(data, threads)
+        outputs = [_train_config(config) for config in configs]
+    else:
+        # torch는 fork 이후 스레드 풀 상태 문제가 있어 spawn으로 워커 생성
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'), initializer=_init_worker, initargs=(data, threads)) as pool:
+            outputs = list(pool.map(_train_config, configs))
+    wall = time.perf_counter() - start
+
+    results = [result for result, _ in outputs]
+    leaderboard = pd.DataFrame(results)
+    order = leaderboard.sort_values('val_mse', kind='stable').index
+    leaderboard = leaderboard.loc[order].reset_index(drop=True)
+
+    os.makedirs(out_dir, exist_ok=True)
+    leaderboard.to_csv(os.path.join(out_dir, 'leaderboard.csv'), encoding='utf-8-sig', index=False)
+    best_idx = order[0]
+    best = results[best_idx]
+    model_path, scaler_path = os.path.join(out_dir, 'normal_train.model'), os.path.join(out_dir, 'scaler.joblib')
+    torch.save(outputs[best_idx][1], model_path)
+    dump(scaler, scaler_path)
+    # 1위 설정을 그대로 new_model로 옮겨 쓸 수 있도록 NumPy 추론 엔진도 함께 저장
+    export_npz(autoencoder_from_state(outputs[best_idx][1]), scaler, os.path.join(out_dir, ENGINE_FILE), X_FILTER,
+               source=source_hash(model_path, scaler_path))
+    with open(os.path.join(out_dir, 'best_config.json'), 'w', encoding='utf-8') as f:
+        json.dump({key: best[key] for key in configs[0]}, f, indent=2)
+
+    total_train = leaderboard['train_sec'].sum()
+    print(f"[sweep] {len(configs)} configs, workers={workers}x{threads} threads, wall {wall:.1f}s "
+          f"(sum of runs {total_train:.1f}s, longest {leaderboard['train_sec'].max():.1f}s)")
+    return leaderboard
+
+if __name__ == "__main__":
+    """
+    Parquet 특징 데이터셋(normal_train.py와 같은 분할)으로 AutoEncoder 하이퍼파라미터 탐색
+    사용법: python -m auto_encoder.sweep [설정 표본 수]
+    """
+    n_samples = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    train_df, test_df = split_dataset(DATASET_DIR, train_columns=X_FILTER, test_columns=X_FILTER + LABEL_COLUMNS)
+    leaderboard = run_sweep(sweep_configs(n_samples=n_samples), train_df, test_df)
+    print(leaderboard.head(10).to_string(float_format=lambda v: f"{v:.4g}"))
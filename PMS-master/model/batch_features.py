@@ -0,0 +1,193 @@
+import numpy as np
+from scipy.stats import skew, kurtosis
+
+from model.registry import FEATURE_COLUMNS, FEATURE_REGISTRY, plan_features
+from model.wavelet import dwt_kernel, DWT_COLUMNS
+from model.spectrum import spectralContext, harmonic_amplitudes, band_mean, envelope_over_threshold
+
+FS = 12800
+WINDOW_SIZE = 12800
+FEATURE_VERSION = '1'  # 특징 계산식이 바뀌면 올려서 featureCache 항목을 무효화
+
+COLUMN_INDEX = {col: idx for idx, col in enumerate(FEATURE_COLUMNS)}
+
+class batchExtractor:
+    """
+    (n_windows, window_size) 형태의 진동 신호 행렬을 입력받아,
+    preProcess와 동일한 특징을 구간 단위 반복 없이 axis=1 기준 배열 연산으로 한 번에 계산하는 클래스.
+    오프라인 학습용 전처리와 실시간 특징 생성에서 공통으로 사용.
+    columns를 지정하면 registry의 실행 계획에 따라 해당 컬럼에 필요한 커널과 중간 결과(스펙트럼, 포락선, DWT)만 계산.
+
+    Parameters
+    ----------
+    fs : int
+        Sampling frequency
+    chunk_size : int
+        Number of windows processed at once (bounds temporary FFT/Hilbert memory)
+    wavelet : str
+        Wavelet name for the DWT features
+    level : int
+        DWT decomposition level (cD1~cD7 column layout is kept)
+    dtype : type
+        Compute dtype (np.float64, or np.float32 to halve memory and bandwidth)
+    columns : list of str, optional
+        Feature columns to compute, in output order (default: FEATURE_COLUMNS)
+
+    Attributes
+    ----------
+    fs : int
+        Sampling frequency
+    chunk_size : int
+        Number of windows processed at once
+    wavelet : str
+        Wavelet name
+    level : int
+        Decomposition level
+    dtype : type
+        Compute dtype
+    columns : list of str
+        Output columns
+    kernels : list of str
+        Kernels planned for the requested columns
+    """
+    def __init__(self, fs=FS, chunk_size=256, wavelet='db4', level=7, dtype=np.float64, columns=None):
+        self.fs = fs
+        self.chunk_size = chunk_size
+        self.wavelet = wavelet
+        self.level = level
+        self.dtype = dtype
+        self.columns = list(FEATURE_COLUMNS if columns is None else columns)
+        not_features = [col for col in self.columns if col not in FEATURE_REGISTRY]
+        if not_features:
+            raise KeyError(f"특징 컬럼이 아닙니다: {', '.join(not_features)}")
+        self.kernels, self.requires = plan_features(self.columns)
+        self.index = {col: idx for idx, col in enumerate(self.columns)}
+
+    def _put(self, out, col, values):
+        if col in self.index:
+            out[:, self.index[col]] = values
+
+    def time_features(self, windows, out):
+        """
+        시간 영역 통계 특징(RMS, 왜도, 첨도, Crest/Shape 계수, 평균, 표준편차, 피크, 1차 차분 통계) 계산
+
+        Parameters
+        ----------
+        windows : np.ndarray
+            Signal matrix of shape (n_windows, window_size)
+        out : np.ndarray
+            Output feature matrix of shape (n_windows, len(self.columns))
+        """
+        if 'time' in self.kernels:
+            abs_windows = np.abs(windows)
+            rms = np.sqrt(np.mean(windows**2, axis=1))
+            peak = np.max(abs_windows, axis=1)
+
+            self._put(out, 'time_rms', rms)
+            if 'time_skewness' in self.index:
+                self._put(out, 'time_skewness', skew(windows, axis=1))
+            if 'time_kurtosis' in self.index:
+                self._put(out, 'time_kurtosis', kurtosis(windows, axis=1))
+            self._put(out, 'time_crest_factor', peak / rms)
+            self._put(out, 'time_shape_factor', rms / np.mean(abs_windows, axis=1))
+            self._put(out, 'time_mean', windows.mean(axis=1))
+            self._put(out, 'time_std', windows.std(axis=1))
+            self._put(out, 'time_peak', peak)
+
+        if 'diff' in self.kernels:
+            diff = np.diff(windows, n=1, axis=1)
+            self._put(out, 'time_mean_diff', diff.mean(axis=1))
+            self._put(out, 'time_std_diff', diff.std(axis=1))
+            self._put(out, 'time_min_diff', diff.min(axis=1))
+            self._put(out, 'time_max_diff', diff.max(axis=1))
+
+    def frequency_features(self, spectrum, out, rpm=None):
+        """
+        FFT 기반 주파수 중심, 대역폭, 피크 주파수, 1x~5x 고조파 진폭,
+        포락선 임곗값 초과 빈 수, 베어링 노이즈(500~2,000Hz 평균 진폭) 계산
+
+        Parameters
+        ----------
+        spectrum : spectralContext
+            Shared spectral context of the signal matrix (n_windows, window_size)
+        out : np.ndarray
+            Output feature matrix of shape (n_windows, len(self.columns))
+        rpm : float, np.ndarray or None
+            Single RPM, or per-window RPMs of shape (n_windows,); None uses the default 1180 RPM
+        """
+        if 'spectral_shape' in self.kernels:
+            mag = spectrum.mag
+            freq = spectrum.freq
+            mag_sum = mag.sum(axis=1)
+            centroid = (mag @ freq) / mag_sum
+            self._put(out, 'fft_centroid', centroid)
+            if 'fft_bandwidth' in self.index:
+                bandwidth = np.sqrt(np.sum(((freq[np.newaxis, :] - centroid[:, np.newaxis])**2) * mag, axis=1) / mag_sum)
+                self._put(out, 'fft_bandwidth', bandwidth)
+            self._put(out, 'fft_peak_freq', freq[np.argmax(mag, axis=1)])
+
+        if 'harmonics' in self.kernels:
+            _, harmonic_amp = harmonic_amplitudes(spectrum, rpm)
+            for order in range(1, 6):
+                self._put(out, f'fft_amp_{order}x', harmonic_amp[:, order - 1])
+
+        if 'noise' in self.kernels:
+            self._put(out, 'fft_noise', band_mean(spectrum, 500, 2000))
+        if 'envelope' in self.kernels:
+            self._put(out, 'fft_over_env', envelope_over_threshold(spectrum, 100))
+
+    def dwt_features(self, windows, out):
+        """
+        웨이블릿 다중 레벨 분해 후 cD1~cD7 계수의 RMS 및 첨도 계산
+
+        Parameters
+        ----------
+        windows : np.ndarray
+            Signal matrix of shape (n_windows, window_size)
+        out : np.ndarray
+            Output feature matrix of shape (n_windows, len(self.columns))
+        """
+        if 'dwt' not in self.kernels:
+            return
+        positions = [self.index.get(col) for col in DWT_COLUMNS]
+        first = positions[0]
+        if first is not None and positions == list(range(first, first + len(DWT_COLUMNS))):
+            # 출력 행렬에서 cD 컬럼이 연속이면 해당 구간에 직접 기록
+            dwt_kernel(windows, self.wavelet, self.level, axis=1, out=out[:, first:first + len(DWT_COLUMNS)])
+            return
+        values = dwt_kernel(windows, self.wavelet, self.level, axis=1)
+        for i, pos in enumerate(positions):
+            if pos is not None:
+                out[:, pos] = values[:, i]
+
+    def extract(self, windows, rpm=None):
+        """
+        신호 행렬 전체에 대해 요청된 특징을 계산하여 미리 할당한 feature 행렬에 채워 반환
+
+        Parameters
+        ----------
+        windows : np.ndarray
+            Signal matrix of shape (n_windows, window_size), or a single window
+        rpm : float, array-like or None
+            Single RPM, or per-window RPMs of shape (n_windows,) for variable-speed pumps
+
+        Returns
+        -------
+        out : np.ndarray
+            Feature matrix of shape (n_windows, len(self.columns)), columns ordered as self.columns
+        """
+        windows = np.atleast_2d(np.asarray(windows, dtype=self.dtype))
+        out = np.empty((windows.shape[0], len(self.columns)), dtype=self.dtype)
+        if rpm is not None and np.ndim(rpm) > 0:
+            rpm = np.asarray(rpm, dtype=np.float64)
+        needs_spectrum = bool(self.requires & {'spectrum', 'envelope'})
+
+        for start in range(0, windows.shape[0], self.chunk_size):
+            chunk = windows[start:start + self.chunk_size]
+            chunk_out = out[start:start + self.chunk_size]
+            chunk_rpm = rpm[start:start + self.chunk_size] if rpm is not None and np.ndim(rpm) > 0 else rpm
+            self.time_features(chunk, chunk_out)
+            if needs_spectrum:
+                self.frequency_features(spectralContext(chunk, self.fs), chunk_out, chunk_rpm)
+            self.dwt_features(chunk, chunk_out)
+        return out
@@ -0,0 +1,177 @@
+import os
+import time
+import sqlite3
+import hashlib
+import numpy as np
+
+from model.batch_features import FEATURE_COLUMNS, FEATURE_VERSION, FS
+from model.parallel_features import parallel_extract
+from model.spectrum import rpm_bucket
+
+_SQL_BATCH = 500  # SQLite 바인딩 변수 제한 이하로 키 조회를 나눔
+
+class featureCache:
+    """
+    구간 원시 바이트의 해시(+ 특징 추출기 버전/설정)를 키로 구간별 특징을 디스크(SQLite)에 저장하는 캐시.
+    재실행 시 새로 추가되거나 바뀐 구간만 특징을 계산하며,
+    저장 용량이 max_bytes를 넘으면 가장 오래전에 사용한 항목부터 제거(LRU).
+
+    Parameters
+    ----------
+    path : str
+        SQLite file path of the cache
+    max_bytes : int
+        Upper bound of stored feature bytes
+    version : str
+        Feature-extractor version (part of every key)
+
+    Attributes
+    ----------
+    hits, misses, evicted : int
+        Counters since the cache object was created
+    """
+    def __init__(self, path='feature_cache.sqlite', max_bytes=512 * 1024**2, version=FEATURE_VERSION):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS features ("
+            "key BLOB PRIMARY KEY, value BLOB NOT NULL, nbytes INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON features (last_used)")
+        self.conn.commit()
+
+    def window_keys(self, windows, rpm=None, **params):
+        """
+        구간별 캐시 키 생성: blake2b(버전 + 추출 설정 + 구간 RPM 버킷 + 구간 원시 바이트)
+
+        Parameters
+        ----------
+        windows : np.ndarray
+            Signal matrix of shape (n_windows, window_size) in the compute dtype
+        rpm : float, array-like or None
+            Single RPM, or per-window RPMs of shape (n_windows,)
+        params : dict
+            Extraction settings (fs, wavelet, level, dtype, columns)
+
+        Returns
+        -------
+        keys : list of bytes
+            16-byte digest per window
+        """
+        config = repr((self.version, sorted((k, str(v)) for k, v in params.items()))).encode()
+        if rpm is None or np.ndim(rpm) == 0:
+            buckets = [rpm_bucket(rpm)] * len(windows)
+        else:
+            buckets = [rpm_bucket(r) for r in np.asarray(rpm, dtype=np.float64)]
+
+        keys = []
+        for window, bucket in zip(windows, buckets):
+            h = hashlib.blake2b(config, digest_size=16)
+            h.update(str(bucket).encode())
+            h.update(np.ascontiguousarray(window).data)
+            keys.append(h.digest())
+        return keys
+
+    def _lookup(self, keys):
+        found = {}
+        for start in range(0, len(keys), _SQL_BATCH):
+            batch = keys[start:start + _SQL_BATCH]
+            placeholders = ','.join('?' * len(batch))
+            rows = self.conn.execute(f"SELECT key, value FROM features WHERE key IN ({placeholders})", batch)
+            found.update(rows.fetchall())
+        if found:
+            now = time.time()
+            self.conn.executemany("UPDATE features SET last_used=? WHERE key=?", [(now, k) for k in found])
+        return found
+
+    def _store(self, keys, rows):
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO features (key, value, nbytes, last_used) VALUES (?, ?, ?, ?)",
+            [(k, row.tobytes(), row.nbytes, now) for k, row in zip(keys, rows)]
+        )
+        self.evict()
+
+    def evict(self):
+        """
+        저장 용량이 max_bytes를 넘으면 가장 오래전에 사용한 항목부터 삭제
+        """
+        total = self.conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM features").fetchone()[0]
+        if total <= self.max_bytes:
+            self.conn.commit()
+            return
+        excess = total - self.max_bytes
+        victims = []
+        for key, nbytes in self.conn.execute("SELECT key, nbytes FROM features ORDER BY last_used ASC"):
+            victims.append((key,))
+            excess -= nbytes
+            if excess <= 0:
+                break
+        self.conn.executemany("DELETE FROM features WHERE key=?", victims)
+        self.conn.commit()
+        self.evicted += len(victims)
+
+    def extract(self, windows, rpm=None, workers=1, fs=FS, chunk_size=256, wavelet='db4', level=7, dtype=np.float64, columns=FEATURE_COLUMNS):
+        """
+        캐시에 없는 구간만 특징을 계산하고(parallel_extract), 나머지는 캐시에서 읽어 전체 특징 행렬 구성
+
+        Parameters
+        ----------
+        windows : np.ndarray
+            Signal matrix of shape (n_windows, window_size)
+        rpm : float, array-like or None
+            Single RPM, or per-window RPMs of shape (n_windows,)
+        workers, fs, chunk_size, wavelet, level, dtype, columns
+            Passed to parallel_extract
+
+        Returns
+        -------
+        features : np.ndarray
+            Feature matrix of shape (n_windows, len(columns)), columns ordered as columns
+        """
+        windows = np.atleast_2d(np.asarray(windows, dtype=dtype))
+        columns = list(columns)
+        keys = self.window_keys(windows, rpm, fs=fs, wavelet=wavelet, level=level, dtype=np.dtype(dtype).name, columns=columns)
+        found = self._lookup(keys)
+
+        features = np.empty((len(windows), len(columns)), dtype=dtype)
+        miss_idx = []
+        for i, key in enumerate(keys):
+            value = found.get(key)
+            if value is None:
+                miss_idx.append(i)
+            else:
+                features[i] = np.frombuffer(value, dtype=dtype)
+        self.hits += len(keys) - len(miss_idx)
+        self.misses += len(miss_idx)
+
+        if miss_idx:
+            miss_idx = np.array(miss_idx)
+            miss_rpm = np.asarray(rpm, dtype=np.float64)[miss_idx] if rpm is not None and np.ndim(rpm) > 0 else rpm
+            computed = parallel_extract(windows[miss_idx], miss_rpm, workers=workers, fs=fs, chunk_size=chunk_size, wavelet=wavelet, level=level, dtype=dtype, columns=columns)
+            features[miss_idx] = computed
+            self._store([keys[i] for i in miss_idx], computed)
+        else:
+            self.conn.commit()
+        return features
+
+    def summary(self):
+        """
+        캐시 적중/미스/제거 건수와 현재 저장 용량 요약 문자열 반환
+        """
+        count, total = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM features").fetchone()
+        requested = self.hits + self.misses
+        ratio = self.hits / requested * 100 if requested else 0.0
+        return (f"[feature-cache] hit={self.hits} miss={self.misses} ({ratio:.1f}% hit), "
+                f"evicted={self.evicted}, entries={count}, size={total / 1024**2:.1f}/{self.max_bytes / 1024**2:.0f} MB")
+
+    def close(self):
+        self.conn.close()
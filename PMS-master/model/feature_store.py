@@ -0,0 +1,151 @@
+import os
+import json
+import shutil
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from model.registry import FEATURE_COLUMNS, LABEL_COLUMNS
+from model.batch_features import FEATURE_VERSION
+from model.load_and_arange import CSV_PATH
+
+DATASET_DIR = 'feature_dataset'
+PARTITION_COLUMN = 'target'
+
+_PARTITIONING = ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]), flavor='hive')
+
+def source_signature(csv_path=CSV_PATH):
+    """
+    원본 csv의 경로/크기/수정 시각 (rawStore 매니페스트와 같은 항목). 원본이 없으면 None
+
+    Returns
+    -------
+    signature : dict or None
+        'source', 'source_size', 'source_mtime'
+    """
+    if not os.path.exists(csv_path):
+        return None
+    stat = os.stat(csv_path)
+    return {'source': os.path.abspath(csv_path), 'source_size': stat.st_size, 'source_mtime': stat.st_mtime}
+
+def write_feature_dataset(feature_df, targets, path=DATASET_DIR, source=None):
+    """
+    preProcess 결과를 target별로 파티션된 Parquet 데이터셋으로 저장 (기존 데이터셋은 교체).
+    특징은 계산 dtype(float64/float32) 그대로, 라벨은 int8로 저장하며 FEATURE_VERSION과 원본 csv 정보를 스키마 메타데이터에 기록
+
+    Parameters
+    ----------
+    feature_df : pandas.DataFrame
+        Output of preProcess.preprocess / preprocess_batch
+    targets : array-like
+        Target label per row (e.g., load_arange()['target'])
+    path : str
+        Root directory of the dataset
+    source : dict, optional
+        source_signature of the raw csv the features were computed from
+
+    Returns
+    -------
+    n_rows : int
+        Number of rows written
+    """
+    df = feature_df.reset_index(drop=True).copy()
+    for col in LABEL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(np.int8)
+    df[PARTITION_COLUMN] = np.asarray(targets, dtype=object)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = {**(table.schema.metadata or {}), b'feature_version': FEATURE_VERSION.encode()}
+    if source is not None:
+        metadata[b'source'] = json.dumps(source).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    tmp_path = path.rstrip('/') + '.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    pq.write_to_dataset(table, tmp_path, partition_cols=[PARTITION_COLUMN])
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    return len(df)
+
+def dataset_exists(path=DATASET_DIR, version=FEATURE_VERSION, source=None):
+    """
+    현재 특징 버전으로 만든 데이터셋이 path에 있는지 확인.
+    source(source_signature)를 주면 같은 크기/수정 시각의 원본 csv에서 만든 데이터셋인지도 확인
+    """
+    if not os.path.isdir(path):
+        return False
+    try:
+        metadata = ds.dataset(path, format='parquet', partitioning=_PARTITIONING).schema.metadata or {}
+    except (pa.ArrowInvalid, FileNotFoundError):
+        return False
+    if metadata.get(b'feature_version') != version.encode():
+        return False
+    return source is None or json.loads(metadata.get(b'source', b'null')) == source
+
+def read_feature_dataset(path=DATASET_DIR, columns=None, targets=None, filters=None):
+    """
+    Parquet 특징 데이터셋에서 필요한 파티션/컬럼/행만 읽음.
+    targets는 파티션 디렉터리 단위로 건너뛰고, filters는 row group 통계로 pushdown되어 조건에 맞지 않는 파일/row group을 읽지 않음
+
+    Parameters
+    ----------
+    path : str
+        Root directory of the dataset
+    columns : list of str, optional
+        Columns to read, in output order (default: all columns including 'target')
+    targets : list of str, optional
+        Partitions to read (e.g., ['normal'])
+    filters : dict, optional
+        Equality predicates {column: value} (e.g., {'real_normal': 1})
+
+    Returns
+    -------
+    df : pandas.DataFrame
+        Selected rows and columns
+    """
+    dataset = ds.dataset(path, format='parquet', partitioning=_PARTITIONING)
+    expr = None
+    if targets is not None:
+        expr = ds.field(PARTITION_COLUMN).isin(list(targets))
+    for col, value in (filters or {}).items():
+        cond = ds.field(col) == value
+        expr = cond if expr is None else expr & cond
+    table = dataset.to_table(columns=list(columns) if columns is not None else None, filter=expr)
+    return table.to_pandas()
+
+def build_feature_dataset(path=DATASET_DIR, cache=None, workers=None, rebuild=False):
+    """
+    데이터셋이 없거나 특징 버전 또는 원본 csv(크기/수정 시각)가 바뀌었으면 원시 데이터를 로드해 모든 특징/라벨을 계산하고 Parquet으로 저장.
+    cache를 주면 원본이 바뀌어도 내용이 같은 구간은 캐시에서 읽고 바뀐 구간만 계산
+
+    Parameters
+    ----------
+    path : str
+        Root directory of the dataset
+    cache : featureCache, optional
+        On-disk feature cache used by preprocess_batch
+    workers : int or None
+        Number of feature-extraction processes
+    rebuild : bool
+        Recompute even if an up-to-date dataset exists
+
+    Returns
+    -------
+    built : bool
+        True if the dataset was (re)written
+    """
+    source = source_signature()
+    if not rebuild and dataset_exists(path, source=source):
+        return False
+    from model.load_and_arange import loadArange
+    from model.preprocess import preProcess
+
+    loader = loadArange()
+    arr_df = loader.load_arange()
+    print(loader.dedup_summary())
+    feature_df = preProcess(arr_df).preprocess_batch(workers=workers, cache=cache, columns=FEATURE_COLUMNS + LABEL_COLUMNS)
+    write_feature_dataset(feature_df, arr_df['target'].to_numpy(), path, source=source)
+    return True
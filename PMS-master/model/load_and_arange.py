@@ -1,75 +1,289 @@
 import os
+import hashlib
 import pandas as pd
 import numpy as np
 
+WINDOW_SIZE = 12800
+
+# (구간 끝 샘플 번호, target): 구간 끝이 해당 번호 이하이면 그 라벨 부여
+CLASS_BOUNDARIES = [
+    (256000, 'bear_fault'),
+    (512000, 'bear_warning'),
+    (768000, 'cavi_fault'),
+    (1024000, 'mis_fault'),
+    (1280000, 'mis_warning'),
+    (1792000, 'normal'),
+    (2048000, 'rotor_fault'),
+    (2304000, 'unbal_fault'),
+    (2560000, 'unbal_warning'),
+]
+DEFAULT_CLASS = 'vane_fault'  # 마지막 경계 이후 구간
+
+# 분석에서 제외하는 클래스
+EXCLUDE_CLASSES = ('mis_warning', 'cavi_fault')
+
+CSV_PATH = 'merged_data/pms_data.csv'  # 작업 디렉터리 기준 원시 데이터 경로
+
+def label_windows(n_windows, window_size=WINDOW_SIZE, boundaries=CLASS_BOUNDARIES, default=DEFAULT_CLASS, start=0):
+    """
+    구간 끝 샘플 번호를 경계 테이블에서 np.searchsorted로 찾아 구간별 target 라벨 생성
+
+    Parameters
+    ----------
+    n_windows : int
+        Number of windows
+    window_size : int
+        Window length
+    boundaries : list of (int, str)
+        Ascending (last sample number, target) table
+    default : str
+        Target for windows past the last boundary
+    start : int
+        Index of the first window (for streams read in chunks)
+
+    Returns
+    -------
+    targets : np.ndarray
+        Object array of target labels, shape (n_windows,)
+    """
+    ends = (np.arange(start, start + n_windows, dtype=np.int64) + 1) * window_size
+    bounds = np.array([bound for bound, _ in boundaries], dtype=np.int64)
+    names = np.array([name for _, name in boundaries] + [default], dtype=object)
+    return names[np.searchsorted(bounds, ends, side='left')]
+
+def _window_bytes(window):
+    return np.ascontiguousarray(window).view(np.uint8)
+
+def dedup_windows(windows, targets, exact=True):
+    """
+    구간 원시 바이트의 blake2b 해시로 (target, 구간) 중복을 찾아 첫 구간만 남기는 마스크 생성.
+    exact=True이면 해시가 같은 구간끼리 바이트를 직접 비교해 해시 충돌로 인한 오삭제를 막음
+
+    Parameters
+    ----------
+    windows : np.ndarray
+        Signal matrix of shape (n_windows, window_size)
+    targets : np.ndarray
+        Target label per window, shape (n_windows,)
+    exact : bool
+        Confirm digest matches with a byte comparison
+
+    Returns
+    -------
+    keep : np.ndarray
+        Boolean mask of shape (n_windows,), False for removed duplicates
+    removed : dict
+        Number of removed duplicates per target (every target in targets is listed)
+    """
+    keep = np.ones(len(windows), dtype=bool)
+    seen = {}  # (target, digest) -> 같은 해시를 가진 서로 다른 구간의 인덱스
+    for i, (target, window) in enumerate(zip(targets, windows)):
+        key = (target, hashlib.blake2b(_window_bytes(window), digest_size=16).digest())
+        firsts = seen.get(key)
+        if firsts is None:
+            seen[key] = [i]
+        elif not exact or any(np.array_equal(_window_bytes(windows[j]), _window_bytes(window)) for j in firsts):
+            keep[i] = False
+        else:
+            firsts.append(i)
+
+    removed = {target: 0 for target in pd.unique(np.asarray(targets))}
+    for target in np.asarray(targets)[~keep]:
+        removed[target] += 1
+    return keep, removed
+
 class loadArange:
     """
     진동 센서 데이터가 저장된 csv 파일을 불러와, 각 클래스(target)에 대해
     12800개 샘플 단위로 구간을 나누고 라벨링하여 데이터셋을 구성하는 클래스
     대상 구간 수에 따라 'bear_fault', 'unbal_warning' 등의 상태 라벨 부여.
     """
-    def __init__(self):
+    def __init__(self, store_dir=None, stream=False, manifest=None, workers=None):
         """
-        진동 센서 데이터가 저장된 csv 파일을 불러와 데이터프레임에 저장
+        진동 센서 데이터가 저장된 csv 파일을 불러와 데이터프레임에 저장.
+        store_dir을 지정하면 csv 대신 model.raw_store로 변환해 둔 바이너리 저장소를 memmap으로 염.
+        stream=True이면 파일을 미리 읽지 않고, iter_windows/iter_arange로 chunk 단위로 읽음.
+        manifest를 지정하면 매니페스트에 나열된 여러 녹음 파일을 병렬로 읽어 구간으로 나눔(model.manifest_loader)
+
+        Parameters
+        ----------
+        store_dir : str, optional
+            Directory created by model.raw_store.convert_csv
+        stream : bool
+            Defer reading the csv to the streaming generators
+        manifest : str, optional
+            Dataset manifest path listing files with their class, fs and channel
+        workers : int or None
+            Pool size of the manifest loader
 
         Attributes
         ----------
         df : pandas.Dataframe
-            Raw sensor data loaded from 'pms_data.csv'
+            Raw sensor data loaded from 'pms_data.csv' (None when a store is used)
+        store : rawStore
+            Memory-mapped binary store (None when the csv is used)
+        windows, meta
+            Window matrix and per-window metadata loaded from the manifest (None otherwise)
+        duplicates : dict
+            Duplicates removed per target by the last load_arange call
+        stream : bool
+            True if only the streaming generators can be used
+        """
+        self.duplicates = {}
+        self.csv_path = '{}/{}'.format(os.getcwd(), CSV_PATH)
+        self.df = None
+        self.store = None
+        self.windows = None
+        self.meta = None
+        self.stream = stream and manifest is None
+        if manifest is not None:
+            from model.manifest_loader import load_from_manifest
+            self.windows, self.meta = load_from_manifest(manifest, workers=workers)
+            return
+        if stream:
+            return
+        if store_dir is not None:
+            from model.raw_store import rawStore  # raw_store가 이 모듈의 경계 테이블을 사용하므로 지연 import
+            self.store = rawStore(store_dir)
+        else:
+            self.df = pd.read_csv(self.csv_path)
+
+    def load_windows(self, dtype=None):
+        """
+        accel 컬럼을 (n_windows, 12800) 행렬로 reshape하고, 경계 테이블로 라벨을 부여한 뒤
+        불필요한 클래스를 마스크로 제거. 마지막의 불완전한 구간은 버림.
+        저장소(store_dir)를 쓰면 행렬을 만들지 않고 클래스별 memmap slice의 구간 view 목록을 반환해
+        RAM보다 큰 저장소도 필요한 페이지만 읽음 (dtype을 저장소와 다르게 지정한 경우에만 클래스별로 변환 복사)
+
+        Parameters
+        ----------
+        dtype : type or None
+            dtype of the windows (None: float64 for the csv, native dtype for the store/manifest)
+
+        Returns
+        -------
+        windows : np.ndarray or list of np.ndarray
+            Signal matrix of shape (n_windows, 12800), or per-window read-only views for the store
+        targets : np.ndarray
+            Target label per window, shape (n_windows,)
         """
-        self.df = pd.read_csv('{}/merged_data/pms_data.csv'.format(os.getcwd()))
+        if self.stream:
+            raise ValueError("stream=True로 만든 loadArange는 파일을 미리 읽지 않습니다. iter_windows/iter_arange를 사용하세요.")
+        if self.meta is not None:
+            return self.windows.astype(dtype or self.windows.dtype, copy=False), self.meta['target'].to_numpy()
+        if self.store is not None:
+            windows, targets = [], []
+            for target, part in self.store.kept_windows():
+                part = part.astype(dtype or part.dtype, copy=False)
+                windows.extend(part)
+                targets.extend([target] * len(part))
+            return windows, np.array(targets, dtype=object)
 
-    def load_arange(self):
+        accel = self.df['accel'].to_numpy(dtype=dtype or np.float64)
+        n_windows = len(accel) // WINDOW_SIZE
+        windows = accel[:n_windows * WINDOW_SIZE].reshape(n_windows, WINDOW_SIZE)
+        targets = label_windows(n_windows)
+
+        keep = ~np.isin(targets, EXCLUDE_CLASSES)
+        return windows[keep], targets[keep]
+
+    def load_arange(self, dtype=None):
         """
         12,800개 단위로 시계열 진동 데이터를 나누고, 각 구간에 해당하는 target 라벨을 부여하여
         분석용 데이터셋(arr_df)을 생성. 중복 제거와 불필요한 클래스 필터링.
 
+        Parameters
+        ----------
+        dtype : type or None
+            dtype of the window arrays (np.float32 halves memory; None: see load_windows)
+
         Returns
         -------
         arr_df : pandas.DataFrame
             DataFrame with columns:
             - 'target' : string label for the condition (e.g., 'normal', 'rotor_fault', ...)
             - 'dt_arr' : np.ndarray containing 12,800-length acceleration sequence.
+        - 'fs' : sampling frequency per window (manifest only; used by preprocess_batch)
         """
-        arr_df = pd.DataFrame(columns=['target', 'dt_arr'])
-
-        target_list = []
-        accel_list = []
-        temp_list = []
-        for num, elem in enumerate(self.df.itertuples()):
-            temp_list.append(elem.accel)
-            if (num+1)%12800 == 0:
-                accel_list.append(np.array(temp_list))
-                temp_list = []
-                if (num+1) <= 256000:
-                    target_list.append('bear_fault')
-                elif (num+1) <= 512000:
-                    target_list.append('bear_warning')
-                elif (num+1) <= 768000:
-                    target_list.append('cavi_fault')
-                elif (num+1) <= 1024000:
-                    target_list.append('mis_fault')
-                elif (num+1) <= 1280000:
-                    target_list.append('mis_warning')
-                elif (num+1) <= 1792000	:
-                    target_list.append('normal')
-                elif (num+1) <= 2048000:
-                    target_list.append('rotor_fault')
-                elif (num+1) <= 2304000:
-                    target_list.append('unbal_fault')
-                elif (num+1) <= 2560000:
-                    target_list.append('unbal_warning')
-                else:
-                    target_list.append('vane_fault')
-        arr_df.target = target_list
-        arr_df.dt_arr = accel_list
-
-        # 불필요한 클래스 제거
-        arr_df = arr_df[arr_df.target!='mis_warning'].reset_index(drop=True)
-        arr_df = arr_df[arr_df.target!='cavi_fault'].reset_index(drop=True)
+        windows, targets = self.load_windows(dtype)
 
         # 중복 제거
-        arr_df['dt_arr_tuple'] = arr_df['dt_arr'].apply(lambda x: tuple(x))
-        arr_df = arr_df.drop_duplicates(subset=['target', 'dt_arr_tuple']).drop(columns='dt_arr_tuple')
+        keep, self.duplicates = dedup_windows(windows, targets)
+        idx = np.flatnonzero(keep)
+        arr_df = pd.DataFrame({'target': targets[keep], 'dt_arr': [windows[i] for i in idx]}, index=idx)
+        if self.meta is not None:
+            arr_df['fs'] = self.meta['fs'].to_numpy()[keep]
+
+        return arr_df
+
+    def dedup_summary(self):
+        """
+        마지막 load_arange에서 제거된 클래스별 중복 구간 수 요약 문자열 반환
+        """
+        total = sum(self.duplicates.values())
+        detail = ', '.join(f"{target}={count}" for target, count in self.duplicates.items())
+        return f"[dedup] removed={total} ({detail})"
 
-        return arr_df
\ No newline at end of file
+    def iter_windows(self, chunksize=1_000_000, dtype=np.float32):
+        """
+        csv를 chunk 단위로 읽어(accel 컬럼만, float32) 완성된 12,800 샘플 구간과 라벨을 순서대로 생성.
+        chunk 경계에 걸친 미완성 구간은 다음 chunk와 이어 붙이며, 제외 클래스 구간은 건너뜀.
+        최대 메모리는 전체 파일이 아니라 chunk 몇 개 수준.
+
+        Parameters
+        ----------
+        chunksize : int
+            Number of csv rows read at once
+        dtype : type
+            dtype of the yielded windows
+
+        Yields
+        ------
+        target : str
+            Target label of the window
+        window : np.ndarray
+            Window of shape (12800,)
+        """
+        carry = np.empty(0, dtype=dtype)
+        n_done = 0
+        for chunk in pd.read_csv(self.csv_path, usecols=['accel'], dtype={'accel': dtype}, chunksize=chunksize):
+            values = chunk['accel'].to_numpy(dtype=dtype)
+            if len(carry):
+                values = np.concatenate([carry, values])
+            n_windows = len(values) // WINDOW_SIZE
+            windows = values[:n_windows * WINDOW_SIZE].reshape(n_windows, WINDOW_SIZE)
+            targets = label_windows(n_windows, start=n_done)
+            for target, window in zip(targets, windows):
+                if target not in EXCLUDE_CLASSES:
+                    yield target, window
+            carry = values[n_windows * WINDOW_SIZE:].copy()
+            n_done += n_windows
+
+    def iter_arange(self, batch_windows=256, chunksize=1_000_000, dtype=np.float32):
+        """
+        iter_windows의 구간을 batch_windows개씩 묶어 load_arange와 같은 형식의 데이터프레임으로 생성.
+        각 배치는 preProcess(df).preprocess_batch()로 바로 특징 추출 가능
+
+        Parameters
+        ----------
+        batch_windows : int
+            Number of windows per yielded DataFrame
+        chunksize : int
+            Number of csv rows read at once
+        dtype : type
+            dtype of the window arrays
+
+        Yields
+        ------
+        arr_df : pandas.DataFrame
+            DataFrame with 'target' and 'dt_arr' columns
+        """
+        targets, windows = [], []
+        for target, window in self.iter_windows(chunksize, dtype):
+            targets.append(target)
+            windows.append(window)
+            if len(windows) == batch_windows:
+                yield pd.DataFrame({'target': targets, 'dt_arr': windows})
+                targets, windows = [], []
+        if windows:
+            yield pd.DataFrame({'target': targets, 'dt_arr': windows})
@@ -0,0 +1,131 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from model.load_and_arange import WINDOW_SIZE, EXCLUDE_CLASSES
+
+def load_manifest(path):
+    """
+    데이터셋 매니페스트(JSON) 로드. 파일 경로는 매니페스트 위치 기준 상대 경로로 해석
+
+    매니페스트 형식::
+
+        {
+          "window_seconds": 1.0,
+          "files": [
+            {"path": "data/pump1_bear_fault.csv", "target": "bear_fault", "fs": 12800, "channel": "accel"},
+            {"path": "data/pump2_normal.npy", "target": "normal", "fs": 12800, "channel": 0}
+          ]
+        }
+
+    Parameters
+    ----------
+    path : str
+        Manifest path
+
+    Returns
+    -------
+    entries : list of dict
+        One entry per file with absolute 'path', 'target', 'fs', 'channel' and 'window_size'
+
+    Raises
+    ------
+    ValueError
+        If a file entry has no 'fs'
+    """
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(path))
+    window_seconds = manifest.get('window_seconds', 1.0)
+
+    entries = []
+    for item in manifest['files']:
+        # 샘플링 주파수는 주파수축/고조파 bin/구간 길이를 모두 결정하므로 기본값 없이 명시해야 함
+        if 'fs' not in item:
+            raise ValueError(f"매니페스트 항목에 샘플링 주파수(fs)가 없습니다: {item['path']}")
+        fs = int(item['fs'])
+        entries.append({
+            **item,
+            'path': os.path.join(base_dir, item['path']),
+            'target': item['target'],
+            'fs': fs,
+            'channel': item.get('channel', 'accel'),
+            'window_size': int(round(fs * window_seconds)),
+        })
+    return entries
+
+def _read_windows(entry, dtype=np.float32):
+    """
+    파일 하나를 읽어 (n_windows, window_size) 구간 행렬로 변환 (마지막 불완전 구간은 버림).
+    csv는 지정한 채널 컬럼만 읽고, .npy는 memmap으로 염
+    """
+    path = entry['path']
+    if path.endswith('.npy'):
+        signal = np.load(path, mmap_mode='r')
+        if signal.ndim > 1:
+            # 다채널 .npy는 channel을 열 번호로 사용
+            signal = signal[:, int(entry['channel'])]
+    else:
+        signal = pd.read_csv(path, usecols=[entry['channel']], dtype={entry['channel']: dtype})[entry['channel']].to_numpy()
+    window_size = entry['window_size']
+    n_windows = len(signal) // window_size
+    return np.asarray(signal[:n_windows * window_size], dtype=dtype).reshape(n_windows, window_size)
+
+def load_from_manifest(path, workers=None, executor='process', dtype=np.float32, exclude=EXCLUDE_CLASSES):
+    """
+    매니페스트의 파일들을 풀(thread/process)로 병렬로 읽어 구간으로 나눈 뒤
+    하나의 구간 행렬과 구간별 라벨 배열로 합침. 로드 시간이 파일 수가 아니라 코어 수에 따라 줄어듦
+
+    Parameters
+    ----------
+    path : str
+        Manifest path (see load_manifest)
+    workers : int or None
+        Pool size (None: all cores, 1: serial)
+    executor : str
+        'process' (csv parsing in parallel) or 'thread' (cheap for .npy files)
+    dtype : type
+        dtype of the window matrix
+    exclude : tuple of str
+        Targets skipped without reading their files
+
+    Returns
+    -------
+    windows : np.ndarray
+        Signal matrix of shape (n_windows, window_size)
+    meta : pandas.DataFrame
+        Per-window 'target', 'fs', 'channel', 'file' (manifest file index) and 'window' (index within the file)
+    """
+    entries = load_manifest(path)
+    file_ids = [i for i, entry in enumerate(entries) if entry['target'] not in exclude]
+    entries = [entries[i] for i in file_ids]
+    sizes = {entry['window_size'] for entry in entries}
+    if len(sizes) > 1:
+        raise ValueError(f"매니페스트의 구간 길이가 서로 다릅니다(fs 확인): {sorted(sizes)}")
+
+    if workers == 1 or len(entries) <= 1:
+        parts = [_read_windows(entry, dtype) for entry in entries]
+    else:
+        pool_cls = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+        with pool_cls(max_workers=workers) as pool:
+            parts = list(pool.map(_read_windows, entries, [dtype] * len(entries)))
+
+    window_size = sizes.pop() if sizes else WINDOW_SIZE
+    counts = [len(part) for part in parts]
+    windows = np.empty((sum(counts), window_size), dtype=dtype)
+    offset = 0
+    for part in parts:
+        windows[offset:offset + len(part)] = part
+        offset += len(part)
+
+    file_idx = np.repeat(np.arange(len(entries)), counts)
+    meta = pd.DataFrame({
+        'target': np.array([entry['target'] for entry in entries], dtype=object)[file_idx],
+        'fs': np.array([entry['fs'] for entry in entries], dtype=np.int64)[file_idx],
+        'channel': np.array([str(entry['channel']) for entry in entries], dtype=object)[file_idx],
+        'file': np.asarray(file_ids, dtype=np.int64)[file_idx],
+        'window': np.concatenate([np.arange(count) for count in counts]) if counts else np.empty(0, dtype=np.int64),
+    })
+    return windows, meta
@@ -0,0 +1,111 @@
+import os
+import numpy as np
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+
+from model.batch_features import batchExtractor, FEATURE_COLUMNS, FS
+
+def _extract_shared(in_name, in_shape, out_name, start, stop, rpm, params):
+    """
+    공유 메모리에 올라간 신호 행렬의 [start, stop) 구간 특징을 계산해 공유 출력 행렬의 같은 행에 기록 (워커 프로세스용)
+
+    Parameters
+    ----------
+    in_name : str
+        Shared memory block name of the signal matrix
+    in_shape : tuple
+        Shape of the signal matrix (n_windows, window_size)
+    out_name : str
+        Shared memory block name of the feature matrix
+    start, stop : int
+        Row range assigned to this task
+    rpm : float, np.ndarray or None
+        RPM for the row range
+    params : dict
+        batchExtractor keyword arguments
+    """
+    in_shm = shared_memory.SharedMemory(name=in_name)
+    out_shm = shared_memory.SharedMemory(name=out_name)
+    try:
+        windows = np.ndarray(in_shape, dtype=params['dtype'], buffer=in_shm.buf)
+        out = np.ndarray((in_shape[0], len(params['columns'])), dtype=params['dtype'], buffer=out_shm.buf)
+        out[start:stop] = batchExtractor(**params).extract(windows[start:stop], rpm)
+        del windows, out
+    finally:
+        in_shm.close()
+        out_shm.close()
+
+def parallel_extract(windows, rpm=None, workers=None, fs=FS, chunk_size=256, wavelet='db4', level=7, dtype=np.float64, columns=FEATURE_COLUMNS):
+    """
+    신호 행렬을 chunk_size 배수 단위로 나누어 프로세스 풀에서 병렬로 특징을 계산.
+    원시 신호는 pickle 없이 multiprocessing.shared_memory로 전달하고,
+    결과는 공유 출력 행렬에 입력과 같은 행 순서로 기록.
+    작업 경계를 chunk_size 배수로 맞춰 직렬 batchExtractor.extract와 동일한 결과를 보장.
+
+    Parameters
+    ----------
+    windows : np.ndarray
+        Signal matrix of shape (n_windows, window_size)
+    rpm : float, array-like or None
+        Single RPM, or per-window RPMs of shape (n_windows,)
+    workers : int, optional
+        Number of worker processes (default: os.cpu_count()); 1 runs serially in-process
+    fs : int
+        Sampling frequency
+    chunk_size : int
+        Number of windows processed at once inside a worker
+    wavelet : str
+        Wavelet name for the DWT features
+    level : int
+        DWT decomposition level
+    dtype : type
+        Compute dtype (np.float64 or np.float32)
+    columns : list of str
+        Feature columns to compute, in output order
+
+    Returns
+    -------
+    features : np.ndarray
+        Feature matrix of shape (n_windows, len(columns)), columns ordered as columns
+    """
+    columns = list(columns)
+    params = {'fs': fs, 'chunk_size': chunk_size, 'wavelet': wavelet, 'level': level, 'dtype': dtype, 'columns': columns}
+    windows = np.atleast_2d(np.asarray(windows, dtype=dtype))
+    n_windows = windows.shape[0]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or n_windows <= chunk_size:
+        return batchExtractor(**params).extract(windows, rpm)
+
+    per_rows = np.ndim(rpm) > 0
+    if per_rows:
+        rpm = np.asarray(rpm, dtype=np.float64)
+
+    # 워커당 비슷한 양이 되도록 작업 크기를 chunk_size 배수로 결정
+    n_chunks = -(-n_windows // chunk_size)
+    task_rows = chunk_size * max(1, -(-n_chunks // (workers * 4)))
+
+    in_shm = shared_memory.SharedMemory(create=True, size=windows.nbytes)
+    out_shm = shared_memory.SharedMemory(create=True, size=n_windows * len(columns) * windows.itemsize)
+    try:
+        shared_windows = np.ndarray(windows.shape, dtype=dtype, buffer=in_shm.buf)
+        shared_windows[:] = windows
+        del shared_windows
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(
+                    _extract_shared, in_shm.name, windows.shape, out_shm.name, start, min(start + task_rows, n_windows),
+                    rpm[start:start + task_rows] if per_rows else rpm, params
+                )
+                for start in range(0, n_windows, task_rows)
+            ]
+            for future in futures:
+                future.result()
+
+        features = np.ndarray((n_windows, len(columns)), dtype=dtype, buffer=out_shm.buf).copy()
+    finally:
+        in_shm.close()
+        in_shm.unlink()
+        out_shm.close()
+        out_shm.unlink()
+    return features
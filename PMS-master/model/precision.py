@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from model.batch_features import batchExtractor, FEATURE_COLUMNS
+
+def compare_precision(windows, columns=FEATURE_COLUMNS, rpm=None, sample_size=256, seed=0):
+    """
+    동일한 표본 구간에 대해 float64/float32 특징을 모두 계산하고, 특징별 오차를 비교
+
+    Parameters
+    ----------
+    windows : np.ndarray
+        Signal matrix of shape (n_windows, window_size)
+    columns : list of str
+        Feature columns to report (e.g., X_FILTER)
+    rpm : float, array-like or None
+        Single RPM, or per-window RPMs of shape (n_windows,)
+    sample_size : int
+        Number of windows randomly sampled for the comparison (all windows if fewer)
+    seed : int
+        Random seed of the sample
+
+    Returns
+    -------
+    report : pandas.DataFrame
+        Per-feature max_abs_err, max_rel_err, mean_rel_err (indexed by feature name)
+    features64 : pandas.DataFrame
+        float64 features of the sample
+    features32 : pandas.DataFrame
+        float32 features of the sample (as float64)
+    """
+    windows = np.atleast_2d(windows)
+    rng = np.random.default_rng(seed)
+    idx = np.sort(rng.choice(len(windows), size=min(sample_size, len(windows)), replace=False))
+    sample = windows[idx]
+    if rpm is not None and np.ndim(rpm) > 0:
+        rpm = np.asarray(rpm, dtype=np.float64)[idx]
+
+    features64 = pd.DataFrame(batchExtractor(dtype=np.float64, columns=columns).extract(sample, rpm), columns=columns)
+    features32 = pd.DataFrame(batchExtractor(dtype=np.float32, columns=columns).extract(sample, rpm).astype(np.float64), columns=columns)
+
+    abs_err = np.abs(features32.to_numpy() - features64.to_numpy())
+    rel_err = abs_err / np.maximum(np.abs(features64.to_numpy()), np.finfo(np.float32).tiny)
+    report = pd.DataFrame({
+        'max_abs_err': abs_err.max(axis=0),
+        'max_rel_err': rel_err.max(axis=0),
+        'mean_rel_err': rel_err.mean(axis=0),
+    }, index=columns)
+    return report, features64, features32
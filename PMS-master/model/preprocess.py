@@ -1,9 +1,48 @@
-import pywt
 import numpy as np
 import pandas as pd
 from scipy.stats import skew, kurtosis
-from scipy.fft import fft, fftfreq
-from scipy.signal import hilbert
+
+from model.registry import FEATURE_COLUMNS, FEATURE_REGISTRY, LABEL_COLUMNS, plan_features
+from model.parallel_features import parallel_extract
+from model.wavelet import dwt_kernel
+from model.spectrum import spectralContext, harmonic_amplitudes, harmonic_bins, band_mean, envelope_over_threshold
+
+def target_labels(target):
+    """
+    target 문자열을 이진/결함 상세 라벨로 변환 (preProcess.preprocess의 라벨링 규칙과 동일)
+
+    Parameters
+    ----------
+    target : str
+        Condition label (e.g., 'normal', 'bear_warning', 'rotor_fault', ...)
+
+    Returns
+    -------
+    labels : list of int
+        Label values ordered as LABEL_COLUMNS
+    """
+    labels = dict.fromkeys(LABEL_COLUMNS, 0)
+    if target == 'normal':
+        labels['normal'] = 1
+        labels['real_normal'] = 1
+    elif 'warning' in target:
+        labels['normal'] = 1
+    else:
+        labels['anomaly'] = 1
+
+    if target in ('bear_warning', 'bear_fault'):
+        labels['bearing'] = 1 if target == 'bear_warning' else 2
+    elif target in ('mis_warning', 'mis_fault'):
+        labels['misalignment'] = 1
+    elif target in ('unbal_warning', 'unbal_fault'):
+        labels['unbalance'] = 1 if target == 'unbal_warning' else 2
+    elif target == 'rotor_fault':
+        labels['rotor'] = 1
+    elif target == 'cavi_fault':
+        labels['cavitation'] = 1
+    elif target == 'vane_fault':
+        labels['vane'] = 1
+    return [labels[col] for col in LABEL_COLUMNS]
 
 class preProcess:
     """
@@ -69,50 +108,43 @@ class preProcess:
         self.df['freq'] = freq_list
         self.df['amp'] = amp_list
 
-    def extract_harmonics(self, amp_arr):
+    def extract_harmonics(self, spectrum, rpm=None):
         """
         FFT 진폭 배열로부터 1x ~ 5x 고조파 주파수 및 진폭 추출
+        (n, fs, rpm) 별로 캐시된 고조파 빈 인덱스 테이블을 사용
 
         Parameters
         ----------
-        amp_arr : np.ndarray
-            Amplitude spectrum
+        spectrum : spectralContext or np.ndarray
+            Shared spectral context of the window, or a two-sided amplitude spectrum
+        rpm : float or None
+            Rotating speed of the window (None uses 1180 RPM)
 
         Returns
         -------
         freq 1x~5x : int
-            Indices corresponding to harmonic frequencies
+            Frequencies (Hz, rounded) of the harmonic bins
         amp_1x~5x : float
             Amplitudes at those harmonic bins
         """
-        fs = 12800
-        N = len(amp_arr)
-        fundamental = 1180 / 60  # 약 19.67 Hz
-
-        # FFT 빈을 구성하는 주파수 배열
-        freq = np.fft.fftfreq(N, d=1/fs)
-
-        # 양의 주파수 영역만 사용
-        freq_positive = freq[:N//2]
-
-        # 기본 주파수에 가장 가까운 인덱스 찾기
-        freq_1x = int(np.around(freq_positive[np.argmin(np.abs(freq_positive - fundamental))]))
-        freq_2x = int(np.around(freq_positive[np.argmin(np.abs(freq_positive - (fundamental*2)))]))
-        freq_3x = int(np.around(freq_positive[np.argmin(np.abs(freq_positive - (fundamental*3)))]))
-        freq_4x = int(np.around(freq_positive[np.argmin(np.abs(freq_positive - (fundamental*4)))]))
-        freq_5x = int(np.around(freq_positive[np.argmin(np.abs(freq_positive - (fundamental*5)))]))
-        
-        amp_1x = amp_arr[freq_1x]
-        amp_2x = amp_arr[freq_2x]
-        amp_3x = amp_arr[freq_3x]
-        amp_4x = amp_arr[freq_4x]
-        amp_5x = amp_arr[freq_5x]
+        if isinstance(spectrum, spectralContext):
+            fs = spectrum.fs
+            N = spectrum.n
+            idx, amps = harmonic_amplitudes(spectrum, rpm)
+        else:
+            fs = 12800
+            N = len(spectrum)
+            idx = harmonic_bins(N, fs, rpm)
+            amps = spectrum[idx]
+
+        freq_1x, freq_2x, freq_3x, freq_4x, freq_5x = (int(f) for f in np.around(idx * fs / N))
+        amp_1x, amp_2x, amp_3x, amp_4x, amp_5x = amps
 
         return freq_1x, freq_2x, freq_3x, freq_4x, freq_5x, amp_1x, amp_2x, amp_3x, amp_4x, amp_5x
 
     def do_extract_harmonics(self):
         """
-        self.df 내 FFT 진폭(amp) 컬럼을 기반으로 고조파 주파수 및 진폭을 추출하여
+        self.df 내 각 구간의 스펙트럼 컨텍스트를 기반으로 고조파 주파수 및 진폭을 추출하여
         관련 컬럼(freq_x, amp_x)으로 저장
         """
         freq_1x_list = []
@@ -129,7 +161,7 @@ class preProcess:
         amp_x_list = []
 
         for elem in self.df.itertuples():
-            freq_1x, freq_2x, freq_3x, freq_4x, freq_5x, amp_1x, amp_2x, amp_3x, amp_4x, amp_5x = self.extract_harmonics(elem.amp)
+            freq_1x, freq_2x, freq_3x, freq_4x, freq_5x, amp_1x, amp_2x, amp_3x, amp_4x, amp_5x = self.extract_harmonics(spectralContext(elem.dt_arr, 12800), getattr(elem, 'rpm', None))
             freq_temp_list = [freq_1x, freq_2x, freq_3x, freq_4x, freq_5x]
             amp_temp_list = [amp_1x, amp_2x, amp_3x, amp_4x, amp_5x]
             freq_1x_list.append(freq_1x)
@@ -180,8 +212,8 @@ class preProcess:
 
         Parameters
         ----------
-        signal : np.ndarray
-            Time-domain signal
+        signal : spectralContext or np.ndarray
+            Shared spectral context of the window, or a time-domain signal
         fs : int
             Sampling frequency
 
@@ -189,9 +221,9 @@ class preProcess:
         -------
             centroid, bandwidth, peak_freq : float
         """
-        fft_vals = np.fft.rfft(signal)
-        fft_freq = np.fft.rfftfreq(len(signal), d=1/fs)
-        mag = np.abs(fft_vals)
+        spectrum = signal if isinstance(signal, spectralContext) else spectralContext(signal, fs)
+        fft_freq = spectrum.freq
+        mag = spectrum.mag
 
         centroid = np.sum(fft_freq * mag) / np.sum(mag)
         bandwidth = np.sqrt(np.sum(((fft_freq - centroid)**2) * mag) / np.sum(mag))
@@ -216,14 +248,7 @@ class preProcess:
         -------
         cD1~cD7 RMS, kurtosis : float
         """
-        coeffs = pywt.wavedec(signal, wavelet, level=level)
-        features = {}
-        for i, c in enumerate(coeffs[1:], 1):  # cD1 ~ cD7
-            features[f'cD{i}_rms'] = np.sqrt(np.mean(c**2))
-            features[f'cD{i}_kurtosis'] = kurtosis(c)
-
-        return features['cD1_rms'], features['cD1_kurtosis'], features['cD2_rms'], features['cD2_kurtosis'], features['cD3_rms'], features['cD3_kurtosis'], features['cD4_rms'], features['cD4_kurtosis'],\
-            features['cD5_rms'], features['cD5_kurtosis'], features['cD6_rms'], features['cD6_kurtosis'], features['cD7_rms'], features['cD7_kurtosis']
+        return tuple(dwt_kernel(signal[np.newaxis, :], wavelet, level)[0])
 
     def env_over_threshold(self, arr):
         """
@@ -231,8 +256,8 @@ class preProcess:
 
         Parameters
         ----------
-        arr : np.ndarray
-            Time-domain signal
+        arr : spectralContext or np.ndarray
+            Shared spectral context of the window, or a time-domain signal
         
         Returns
         -------
@@ -240,14 +265,8 @@ class preProcess:
             Number of frequency bins exceeding threshold
         """
         threshold = 100
-        signal = hilbert(arr)
-        envelope = np.abs(signal)
-        n = len(envelope)
-        fs = 12800
-        fft_vals = np.abs(fft(envelope))[:n // 2]
-        fft_freqs = fftfreq(n, 1/fs)[:n // 2]
-        temp_df = pd.DataFrame(data=fft_vals, columns=['value'])
-        num_over = len(temp_df[temp_df.value>threshold])
+        spectrum = arr if isinstance(arr, spectralContext) else spectralContext(arr, 12800)
+        num_over = int(envelope_over_threshold(spectrum, threshold))
         return num_over
 
     def bearing_noise(self, arr):
@@ -256,25 +275,22 @@ class preProcess:
 
         Parameters
         ----------
-        arr : np.ndarray
-            Time-domain signal
+        arr : spectralContext or np.ndarray
+            Shared spectral context of the window, or a time-domain signal
 
         Returns
         -------
-        temp_df.amp.mean() : float
+        mean_amp : float
             Mean amplitude in target band
         """
-        freq, amp = self.fourier_transform(arr)
-        temp_df = pd.DataFrame(columns=['freq', 'amp'])
-        temp_df['freq'] = freq
-        temp_df['amp'] = amp
-        temp_df = temp_df[(temp_df.freq>=500)&(temp_df.freq<=2000)].reset_index(drop=True)
-        return temp_df.amp.mean()
+        spectrum = arr if isinstance(arr, spectralContext) else spectralContext(arr, 12800)
+        return float(band_mean(spectrum, 500, 2000))
 
     def preprocess(self):
         """
         전체 전처리 및 특징 추출 수행
-        - FFT, 고조파, 시간/주파수/DWT 영역 특징 계산
+        - 구간별 스펙트럼 컨텍스트(FFT 1회)를 만들어 고조파/주파수/포락선 특징이 공유
+        - 시간/주파수/DWT 영역 특징 계산
         - 변동성 및 포락선(envelope) 지표 추출
         - 결함 라벨링(normal/anomaly+상세 fault)
 
@@ -283,9 +299,6 @@ class preProcess:
         result_df : pandas.DataFrame
             Feature dataframe with extracted features and binary/multi-class labels
         """
-        self.do_fourier_transform()
-        self.do_extract_harmonics()
-
         result_df = pd.DataFrame(
             columns = [
                 'time_rms', 'time_skewness', 'time_kurtosis', 'time_crest_factor', 'time_shape_factor',
@@ -357,7 +370,9 @@ class preProcess:
 
         for elem in self.df.itertuples():
             rms, peak, skewness, kurto, crest_factor, shape_factor = self.extract_time_features(elem.dt_arr)
-            centroid, bandwidth, peak_freq = self.extract_frequency_features(elem.dt_arr, 12800)
+            spectrum = spectralContext(elem.dt_arr, 12800)
+            centroid, bandwidth, peak_freq = self.extract_frequency_features(spectrum, 12800)
+            _, _, _, _, _, amp_1x, amp_2x, amp_3x, amp_4x, amp_5x = self.extract_harmonics(spectrum, getattr(elem, 'rpm', None))
 
             cD1_rms, cD1_kurtosis, cD2_rms, cD2_kurtosis, cD3_rms, cD3_kurtosis,\
             cD4_rms, cD4_kurtosis, cD5_rms, cD5_kurtosis, cD6_rms, cD6_kurtosis, cD7_rms, cD7_kurtosis = self.extract_dwt_features(elem.dt_arr)
@@ -383,8 +398,8 @@ class preProcess:
             bandwidth_list.append(bandwidth)
             peak_freq_list.append(peak_freq)
 
-            fft_over_env_list.append(self.env_over_threshold(elem.dt_arr))
-            fft_noise_list.append(self.bearing_noise(elem.dt_arr))
+            fft_over_env_list.append(self.env_over_threshold(spectrum))
+            fft_noise_list.append(self.bearing_noise(spectrum))
 
             cD1_rms_list.append(cD1_rms)
             cD1_kurtosis_list.append(cD1_kurtosis)
@@ -414,11 +429,11 @@ class preProcess:
                 anomaly_list.append(1)
                 real_normal_list.append(0)
 
-            amp_1x_list.append(elem.amp_1x)
-            amp_2x_list.append(elem.amp_2x)
-            amp_3x_list.append(elem.amp_3x)
-            amp_4x_list.append(elem.amp_4x)
-            amp_5x_list.append(elem.amp_5x)
+            amp_1x_list.append(amp_1x)
+            amp_2x_list.append(amp_2x)
+            amp_3x_list.append(amp_3x)
+            amp_4x_list.append(amp_4x)
+            amp_5x_list.append(amp_5x)
 
             if (elem.target=='bear_warning') or (elem.target=='bear_fault'):
                 if elem.target == 'bear_warning':
@@ -522,4 +537,65 @@ class preProcess:
         result_df[result_df.columns[42]] = cavitation_list
         result_df[result_df.columns[43]] = vane_list
         result_df[result_df.columns[44]] = real_normal_list
-        return result_df
\ No newline at end of file
+        return result_df
+
+    def preprocess_batch(self, chunk_size=256, wavelet='db4', level=7, workers=1, dtype=np.float64, cache=None, columns=None, fs=None):
+        """
+        preprocess와 동일한 컬럼의 결과를 배치(행렬) 모드로 생성
+        - dt_arr를 (n_windows, 12800) 행렬로 쌓아 batchExtractor로 모든 특징을 한 번에 계산 (workers > 1이면 프로세스 병렬)
+        - 'rpm' 컬럼이 있으면 구간별 RPM으로 고조파 진폭 계산
+        - 'fs' 컬럼(매니페스트 로드)이 있으면 그 샘플링 주파수로 주파수축/고조파/대역 특징 계산
+        - 라벨은 고유 target별로 한 번만 계산한 뒤 인덱스로 펼침
+        - columns를 지정하면 registry 실행 계획에 따라 해당 컬럼에 필요한 특징/라벨만 계산
+          (예: 추론 전용은 X_FILTER만 요청하여 라벨과 fft_noise 생략)
+
+        Parameters
+        ----------
+        chunk_size : int
+            Number of windows processed at once by batchExtractor
+        wavelet : str
+            Wavelet name for the DWT features
+        level : int
+            DWT decomposition level (cD1~cD7 column layout is kept)
+        workers : int or None
+            Number of feature-extraction processes (None: all cores, 1: serial)
+        dtype : type
+            Compute dtype (np.float32 enables the single-precision pipeline)
+        cache : featureCache, optional
+            On-disk feature cache; only windows missing from it are computed
+        columns : list of str, optional
+            Requested feature/label columns in output order (default: all features + all labels)
+        fs : int, optional
+            Sampling frequency (default: the 'fs' column if present, otherwise 12800)
+
+        Returns
+        -------
+        result_df : pandas.DataFrame
+            Feature dataframe with extracted features and binary/multi-class labels
+        """
+        if columns is None:
+            columns = FEATURE_COLUMNS + LABEL_COLUMNS
+        kernels, _ = plan_features(columns)
+        feature_columns = [col for col in columns if col in FEATURE_REGISTRY]
+        result_df = pd.DataFrame(index=range(len(self.df)))
+
+        if feature_columns:
+            windows = np.stack(self.df['dt_arr'].to_numpy())
+            rpm = self.df['rpm'].to_numpy(dtype=np.float64) if 'rpm' in self.df.columns else None
+            if fs is None and 'fs' in self.df.columns:
+                rates = pd.unique(self.df['fs'])
+                if len(rates) > 1:
+                    raise ValueError(f"샘플링 주파수가 서로 다른 구간은 함께 처리할 수 없습니다: {sorted(rates)}")
+                fs = int(rates[0]) if len(rates) else None
+            extract = cache.extract if cache is not None else parallel_extract
+            features = extract(windows, rpm, workers=workers, fs=fs or 12800, chunk_size=chunk_size, wavelet=wavelet, level=level, dtype=dtype, columns=feature_columns)
+            result_df = pd.DataFrame(features, columns=feature_columns)
+
+        if 'labels' in kernels:
+            codes, uniques = pd.factorize(self.df['target'])
+            label_table = np.array([target_labels(target) for target in uniques], dtype=np.int64).reshape(-1, len(LABEL_COLUMNS))
+            labels = label_table[codes]
+            for idx, col in enumerate(LABEL_COLUMNS):
+                if col in columns:
+                    result_df[col] = labels[:, idx]
+        return result_df[list(columns)]
@@ -0,0 +1,167 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+
+from model.load_and_arange import WINDOW_SIZE, CLASS_BOUNDARIES, DEFAULT_CLASS, EXCLUDE_CLASSES, label_windows
+
+STORE_VERSION = 1
+SIGNAL_FILE = 'accel.f32'
+MANIFEST_FILE = 'manifest.json'
+
+def convert_csv(csv_path, store_dir, chunksize=1_000_000, window_size=WINDOW_SIZE):
+    """
+    pms_data.csv의 accel 컬럼을 한 번만 읽어 float32 원시 바이너리(accel.f32)와
+    라벨 경계 매니페스트(manifest.json)로 변환. CSV는 chunk 단위로 읽어 전체를 메모리에 올리지 않음.
+
+    Parameters
+    ----------
+    csv_path : str
+        Source csv path (e.g., 'merged_data/pms_data.csv')
+    store_dir : str
+        Output directory of the binary store
+    chunksize : int
+        Number of csv rows read at once
+    window_size : int
+        Window length recorded in the manifest
+
+    Returns
+    -------
+    manifest : dict
+        Written manifest
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    signal_path = os.path.join(store_dir, SIGNAL_FILE)
+    tmp_path = signal_path + '.tmp'
+
+    n_samples = 0
+    with open(tmp_path, 'wb') as f:
+        for chunk in pd.read_csv(csv_path, usecols=['accel'], dtype={'accel': np.float32}, chunksize=chunksize):
+            values = chunk['accel'].to_numpy(dtype=np.float32)
+            values.tofile(f)
+            n_samples += len(values)
+    os.replace(tmp_path, signal_path)
+
+    stat = os.stat(csv_path)
+    manifest = {
+        'version': STORE_VERSION,
+        'dtype': 'float32',
+        'n_samples': n_samples,
+        'window_size': window_size,
+        'boundaries': [[bound, name] for bound, name in CLASS_BOUNDARIES],
+        'default_class': DEFAULT_CLASS,
+        'exclude_classes': list(EXCLUDE_CLASSES),
+        'source': os.path.abspath(csv_path),
+        'source_size': stat.st_size,
+        'source_mtime': stat.st_mtime,
+    }
+    with open(os.path.join(store_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return manifest
+
+class rawStore:
+    """
+    convert_csv로 만든 바이너리 저장소를 np.memmap으로 열어 구간을 복사 없는 view로 제공하는 클래스.
+    파일을 파싱하지 않으므로 여는 데 수 ms이며, RAM보다 큰 아카이브도 필요한 페이지만 읽음.
+
+    Parameters
+    ----------
+    store_dir : str
+        Directory holding accel.f32 and manifest.json
+    rebuild : bool
+        Reconvert the source csv if it changed since the store was built (otherwise raise ValueError)
+
+    Attributes
+    ----------
+    manifest : dict
+        Store manifest (dtype, n_samples, window_size, label boundaries)
+    accel : np.memmap
+        Read-only 1-D signal of shape (n_samples,)
+    windows : np.ndarray
+        Read-only view of shape (n_windows, window_size); the trailing partial window is dropped
+    targets : np.ndarray
+        Target label per window, shape (n_windows,)
+    """
+    def __init__(self, store_dir, rebuild=False):
+        self.store_dir = store_dir
+        self.manifest = self._read_manifest()
+        if self.source_changed():
+            if not rebuild:
+                raise ValueError(f"저장소 생성 이후 원본 csv가 변경되었습니다: {self.manifest['source']} "
+                                 f"(python -m model.raw_store로 다시 변환하거나 rebuild=True로 여세요)")
+            convert_csv(self.manifest['source'], store_dir, window_size=self.manifest['window_size'])
+            self.manifest = self._read_manifest()
+
+        self.window_size = self.manifest['window_size']
+        self.exclude_classes = tuple(self.manifest['exclude_classes'])
+        self.accel = np.memmap(os.path.join(store_dir, SIGNAL_FILE), dtype=self.manifest['dtype'], mode='r', shape=(self.manifest['n_samples'],))
+
+        n_windows = len(self.accel) // self.window_size
+        self.windows = self.accel[:n_windows * self.window_size].reshape(n_windows, self.window_size)
+        boundaries = [(bound, name) for bound, name in self.manifest['boundaries']]
+        self.targets = label_windows(n_windows, self.window_size, boundaries, self.manifest['default_class'])
+
+    def _read_manifest(self):
+        with open(os.path.join(self.store_dir, MANIFEST_FILE), encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') != STORE_VERSION:
+            raise ValueError(f"지원하지 않는 저장소 버전입니다: {manifest.get('version')}")
+        return manifest
+
+    def source_changed(self):
+        """
+        원본 csv의 크기/수정 시각이 변환 당시와 다른지 확인 (원본이 없으면 저장소만으로 사용하므로 False)
+        """
+        source = self.manifest.get('source')
+        if not source or not os.path.exists(source):
+            return False
+        stat = os.stat(source)
+        return (stat.st_size, stat.st_mtime) != (self.manifest.get('source_size'), self.manifest.get('source_mtime'))
+
+    def __len__(self):
+        return len(self.windows)
+
+    def class_windows(self, target):
+        """
+        특정 클래스의 구간들을 복사 없는 view로 반환 (클래스 구간은 연속이므로 slice 하나로 표현됨)
+
+        Parameters
+        ----------
+        target : str
+            Target label (e.g., 'normal')
+
+        Returns
+        -------
+        windows : np.ndarray
+            Read-only view of shape (n_class_windows, window_size)
+        """
+        idx = np.flatnonzero(self.targets == target)
+        if len(idx) == 0:
+            return self.windows[:0]
+        return self.windows[idx[0]:idx[-1] + 1]
+
+    def kept_windows(self):
+        """
+        제외 클래스를 뺀 클래스별 구간을 경계 테이블 순서대로 복사 없는 view로 반환
+
+        Returns
+        -------
+        parts : list of (str, np.ndarray)
+            (target, read-only view of shape (n_class_windows, window_size)) per kept class
+        """
+        targets = pd.unique(self.targets)
+        return [(target, self.class_windows(target)) for target in targets if target not in self.exclude_classes]
+
+    def keep_mask(self):
+        """
+        분석에서 제외하는 클래스를 걸러내는 구간 마스크
+        """
+        return ~np.isin(self.targets, self.exclude_classes)
+
+if __name__ == '__main__':
+    import sys
+
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else 'merged_data/pms_data.csv'
+    store_dir = sys.argv[2] if len(sys.argv) > 2 else 'merged_data/pms_data_store'
+    manifest = convert_csv(csv_path, store_dir)
+    print(f"[raw-store] {manifest['n_samples']} samples -> {store_dir}")
@@ -0,0 +1,71 @@
+# 특징/라벨 컬럼의 단일 정의(registry)
+# 각 특징은 계산 커널(kernel)과 필요한 중간 결과(requires)를 선언하며,
+# plan_features가 요청된 컬럼에 필요한 커널과 중간 결과만 골라 실행 계획을 만든다.
+#
+# requires 종류
+# - 'diff'     : 1차 차분 신호
+# - 'spectrum' : 단측 진폭 스펙트럼 (spectralContext.mag)
+# - 'envelope' : Hilbert 포락선 스펙트럼 (spectralContext.env_mag)
+# - 'dwt'      : 다중 레벨 웨이블릿 분해
+# - 'target'   : 구간의 상태 라벨 문자열
+
+_TIME = {'kernel': 'time', 'requires': ()}
+_DIFF = {'kernel': 'diff', 'requires': ('diff',)}
+_SHAPE = {'kernel': 'spectral_shape', 'requires': ('spectrum',)}
+_HARMONIC = {'kernel': 'harmonics', 'requires': ('spectrum',)}
+_DWT = {'kernel': 'dwt', 'requires': ('dwt',)}
+_LABEL = {'kernel': 'labels', 'requires': ('target',)}
+
+FEATURE_REGISTRY = {
+    'time_rms': _TIME, 'time_skewness': _TIME, 'time_kurtosis': _TIME, 'time_crest_factor': _TIME, 'time_shape_factor': _TIME,
+    'time_mean': _TIME, 'time_std': _TIME, 'time_peak': _TIME,
+    'time_mean_diff': _DIFF, 'time_std_diff': _DIFF, 'time_min_diff': _DIFF, 'time_max_diff': _DIFF,
+
+    'fft_centroid': _SHAPE, 'fft_bandwidth': _SHAPE, 'fft_peak_freq': _SHAPE,
+    'fft_over_env': {'kernel': 'envelope', 'requires': ('envelope',)},
+    'fft_noise': {'kernel': 'noise', 'requires': ('spectrum',)},
+    'fft_amp_1x': _HARMONIC, 'fft_amp_2x': _HARMONIC, 'fft_amp_3x': _HARMONIC, 'fft_amp_4x': _HARMONIC, 'fft_amp_5x': _HARMONIC,
+
+    'cD1_rms': _DWT, 'cD1_kurtosis': _DWT, 'cD2_rms': _DWT, 'cD2_kurtosis': _DWT, 'cD3_rms': _DWT, 'cD3_kurtosis': _DWT, 'cD4_rms': _DWT, 'cD4_kurtosis': _DWT,
+    'cD5_rms': _DWT, 'cD5_kurtosis': _DWT, 'cD6_rms': _DWT, 'cD6_kurtosis': _DWT, 'cD7_rms': _DWT, 'cD7_kurtosis': _DWT,
+}
+
+# preprocess 결과의 특징 컬럼 순서 (fft_noise 포함)
+FEATURE_COLUMNS = list(FEATURE_REGISTRY)
+
+# AutoEncoder 입력 / realtime_table 컬럼 (fft_noise 제외)
+X_FILTER = [col for col in FEATURE_COLUMNS if col != 'fft_noise']
+
+LABEL_COLUMNS = [
+    'normal', 'anomaly',
+    'bearing', 'misalignment', 'unbalance', 'rotor', 'cavitation', 'vane',
+    'real_normal'
+]
+LABEL_REGISTRY = {col: _LABEL for col in LABEL_COLUMNS}
+
+# 커널 실행 순서
+KERNEL_ORDER = ['time', 'diff', 'spectral_shape', 'harmonics', 'noise', 'envelope', 'dwt', 'labels']
+
+def plan_features(columns):
+    """
+    요청된 컬럼 목록을 계산하는 데 필요한 커널과 중간 결과만 골라 실행 계획 생성
+
+    Parameters
+    ----------
+    columns : list of str
+        Requested feature and/or label columns
+
+    Returns
+    -------
+    kernels : list of str
+        Kernels to run, in KERNEL_ORDER
+    requires : set of str
+        Intermediate results needed by those kernels
+    """
+    unknown = [col for col in columns if col not in FEATURE_REGISTRY and col not in LABEL_REGISTRY]
+    if unknown:
+        raise KeyError(f"등록되지 않은 컬럼입니다: {', '.join(unknown)}")
+    specs = [FEATURE_REGISTRY.get(col) or LABEL_REGISTRY[col] for col in columns]
+    kernels = {spec['kernel'] for spec in specs}
+    requires = {req for spec in specs for req in spec['requires']}
+    return [kernel for kernel in KERNEL_ORDER if kernel in kernels], requires
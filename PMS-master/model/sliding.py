@@ -0,0 +1,216 @@
+import numpy as np
+from collections import deque
+
+from model.registry import X_FILTER
+from model.batch_features import batchExtractor, FEATURE_COLUMNS, COLUMN_INDEX, FS, WINDOW_SIZE
+from model.spectrum import spectralContext
+
+# realtime_table 컬럼 순서
+REALTIME_COLUMNS = X_FILTER
+
+def sliding_windows(signal, window_size=WINDOW_SIZE, hop=WINDOW_SIZE):
+    """
+    1-D 신호를 hop 간격의 (겹칠 수 있는) 구간 행렬로 변환. 복사 없이 stride view로 반환
+
+    Parameters
+    ----------
+    signal : np.ndarray
+        1-D time-domain signal
+    window_size : int
+        Window length
+    hop : int
+        Step between window starts (window_size means non-overlapping)
+
+    Returns
+    -------
+    windows : np.ndarray
+        Read-only view of shape (n_windows, window_size)
+    """
+    signal = np.asarray(signal)
+    if len(signal) < window_size:
+        return np.empty((0, window_size), dtype=signal.dtype)
+    return np.lib.stride_tricks.sliding_window_view(signal, window_size)[::hop]
+
+class _monotonicDeque:
+    """
+    슬라이딩 구간의 최댓값(또는 최솟값)을 원소당 O(1) 분할 상환 비용으로 유지하는 단조 덱
+    """
+    def __init__(self, mode='max'):
+        self.items = deque()
+        self.better = (lambda a, b: a >= b) if mode == 'max' else (lambda a, b: a <= b)
+
+    def push(self, idx, value):
+        while self.items and self.better(value, self.items[-1][1]):
+            self.items.pop()
+        self.items.append((idx, value))
+
+    def expire(self, oldest_idx):
+        while self.items and self.items[0][0] < oldest_idx:
+            self.items.popleft()
+
+    def top(self):
+        return self.items[0][1]
+
+class slidingExtractor:
+    """
+    연속 스트림에서 window_size 구간을 hop 간격으로 겹쳐 이동하며 특징 행을 생성하는 클래스.
+
+    시간 영역 특징은 hop 단위 블록의 부분합(합, 제곱합, 3/4제곱합, 절댓값합)과
+    1차 차분 부분합을 링으로 유지해 구간 전체를 다시 읽지 않고 계산하며,
+    피크와 차분 최소/최대는 단조 덱으로 유지. 스펙트럼/웨이블릿 특징만 hop마다 다시 계산.
+
+    Parameters
+    ----------
+    window_size : int
+        Window length
+    hop : int
+        Step between consecutive windows (window_size must be a multiple of hop)
+    fs : int
+        Sampling frequency
+    rpm : float or None
+        RPM used for harmonic amplitudes
+    wavelet : str
+        Wavelet name for the DWT features
+    level : int
+        DWT decomposition level
+
+    Attributes
+    ----------
+    buffer : np.ndarray
+        Last window_size samples of the stream
+    n_blocks : int
+        Number of hop blocks per window
+    """
+    def __init__(self, window_size=WINDOW_SIZE, hop=WINDOW_SIZE // 4, fs=FS, rpm=None, wavelet='db4', level=7):
+        if hop <= 0 or window_size % hop != 0:
+            raise ValueError(f"window_size({window_size})는 hop({hop})의 배수여야 합니다.")
+        self.window_size = window_size
+        self.hop = hop
+        self.fs = fs
+        self.rpm = rpm
+        self.n_blocks = window_size // hop
+        self.extractor = batchExtractor(fs=fs, chunk_size=1, wavelet=wavelet, level=level)
+
+        self.buffer = np.zeros(window_size, dtype=np.float64)
+        self.pending = np.empty(0, dtype=np.float64)
+        self.ref = None  # 모멘트 합의 상쇄 오차를 줄이기 위한 기준값
+        self.block_id = 0
+        self.diff_id = 0
+        self.diff_expired = 0  # 구간을 벗어나 제거된 차분 항목 수 (남은 가장 오래된 항목의 diff_id)
+        self.diff_count = 0  # diff_stats에 남은 차분 원소 수
+        self.last_sample = None
+
+        self.sample_stats = deque()  # (n, s1, s2, s3, s4, sabs) per block
+        self.diff_stats = deque()  # (n, s1, s2) per boundary / in-block diff run
+        self.peak = _monotonicDeque('max')
+        self.diff_max = _monotonicDeque('max')
+        self.diff_min = _monotonicDeque('min')
+
+    def _push_diffs(self, diffs):
+        if len(diffs) == 0:
+            return
+        self.diff_stats.append((len(diffs), diffs.sum(), np.dot(diffs, diffs)))
+        self.diff_count += len(diffs)
+        self.diff_max.push(self.diff_id, diffs.max())
+        self.diff_min.push(self.diff_id, diffs.min())
+        self.diff_id += 1
+
+    def _push_block(self, block):
+        if self.ref is None:
+            self.ref = float(block.mean())
+        shifted = block - self.ref
+        sq = shifted * shifted
+        self.sample_stats.append((len(block), shifted.sum(), sq.sum(), np.dot(sq, shifted), np.dot(sq, sq), np.abs(block).sum()))
+        self.peak.push(self.block_id, np.abs(block).max())
+        self.block_id += 1
+
+        # 이전 블록과의 경계 차분, 블록 내부 차분 순서로 추가
+        if self.last_sample is not None:
+            self._push_diffs(block[:1] - self.last_sample)
+        self._push_diffs(np.diff(block))
+        self.last_sample = block[-1]
+
+        while len(self.sample_stats) > self.n_blocks:
+            self.sample_stats.popleft()
+        self.peak.expire(self.block_id - self.n_blocks)
+
+        # 구간 내 차분은 window_size - 1개: 항목 수가 아니라 원소 수로 오래된 항목을 제거
+        # (hop=1이면 블록 내부 차분이 비어 경계 차분 항목만 쌓이므로 항목 수는 원소 수와 다름)
+        while self.diff_stats and self.diff_count - self.diff_stats[0][0] >= self.window_size - 1:
+            self.diff_count -= self.diff_stats.popleft()[0]
+            self.diff_expired += 1
+        self.diff_max.expire(self.diff_expired)
+        self.diff_min.expire(self.diff_expired)
+
+        self.buffer[:-self.hop] = self.buffer[self.hop:]
+        self.buffer[-self.hop:] = block
+
+    def time_features(self, out):
+        """
+        블록 부분합과 단조 덱으로부터 현재 구간의 시간 영역 특징 계산
+
+        Parameters
+        ----------
+        out : np.ndarray
+            Output feature row of length len(FEATURE_COLUMNS)
+        """
+        n, s1, s2, s3, s4, sabs = np.sum(self.sample_stats, axis=0)
+        m1 = s1 / n
+        var = s2 / n - m1**2
+        m3 = s3 / n - 3*m1*s2/n + 2*m1**3
+        m4 = s4 / n - 4*m1*s3/n + 6*m1**2*s2/n - 3*m1**4
+        mean = self.ref + m1
+        ms = var + mean**2
+        rms = np.sqrt(ms)
+        peak = self.peak.top()
+
+        out[COLUMN_INDEX['time_rms']] = rms
+        out[COLUMN_INDEX['time_skewness']] = m3 / var**1.5
+        out[COLUMN_INDEX['time_kurtosis']] = m4 / var**2 - 3.0
+        out[COLUMN_INDEX['time_crest_factor']] = peak / rms
+        out[COLUMN_INDEX['time_shape_factor']] = rms / (sabs / n)
+        out[COLUMN_INDEX['time_mean']] = mean
+        out[COLUMN_INDEX['time_std']] = np.sqrt(max(var, 0.0))
+        out[COLUMN_INDEX['time_peak']] = peak
+
+        dn, d1, d2 = np.sum(self.diff_stats, axis=0)
+        diff_mean = d1 / dn
+        out[COLUMN_INDEX['time_mean_diff']] = diff_mean
+        out[COLUMN_INDEX['time_std_diff']] = np.sqrt(max(d2 / dn - diff_mean**2, 0.0))
+        out[COLUMN_INDEX['time_min_diff']] = self.diff_min.top()
+        out[COLUMN_INDEX['time_max_diff']] = self.diff_max.top()
+
+    def _emit(self):
+        out = np.empty((1, len(FEATURE_COLUMNS)), dtype=np.float64)
+        self.time_features(out[0])
+        window = self.buffer[np.newaxis, :]
+        self.extractor.frequency_features(spectralContext(window, self.fs), out, self.rpm)
+        self.extractor.dwt_features(window, out)
+        return out[0]
+
+    def push(self, samples):
+        """
+        새 샘플을 스트림에 추가하고, 완성된 hop마다 (첫 구간이 찬 이후) 특징 행을 생성.
+        샘플 반영과 pending 정리는 호출 즉시 끝나므로 반환값을 쓰지 않아도 스트림 상태는 일관됨
+
+        Parameters
+        ----------
+        samples : array-like
+            New time-domain samples of any length
+
+        Returns
+        -------
+        rows : list of dict
+            realtime_table-compatible feature rows (REALTIME_COLUMNS -> float), one per completed hop
+        """
+        self.pending = np.concatenate([self.pending, np.asarray(samples, dtype=np.float64).ravel()])
+        n_ready = len(self.pending) // self.hop
+        blocks, self.pending = self.pending[:n_ready*self.hop], self.pending[n_ready*self.hop:]
+
+        rows = []
+        for i in range(n_ready):
+            self._push_block(blocks[i*self.hop:(i+1)*self.hop])
+            if self.block_id >= self.n_blocks:
+                row = self._emit()
+                rows.append({col: float(row[COLUMN_INDEX[col]]) for col in REALTIME_COLUMNS})
+        return rows
@@ -0,0 +1,249 @@
+import numpy as np
+from functools import lru_cache
+from scipy import fft as sp_fft
+from scipy.signal import hilbert
+
+RPM = 1180  # 기본 회전 속도 (기본 주파수 약 19.67 Hz)
+RPM_BUCKET = 10  # 고조파 인덱스 캐시용 RPM 양자화 단위
+HARMONIC_ORDERS = 5
+NOISE_BAND = (500, 2000)  # 베어링 노이즈 대역 (Hz)
+ENV_THRESHOLD = 100  # 포락선 스펙트럼 진폭 임곗값
+
+@lru_cache(maxsize=16)
+def rfft_freq(n, fs, dtype=np.float64):
+    """
+    길이 n, 샘플링 주파수 fs인 신호의 단측(rfft) 주파수 축 생성 (읽기 전용으로 캐시하여 공유)
+
+    Parameters
+    ----------
+    n : int
+        Signal length
+    fs : int
+        Sampling frequency
+    dtype : type
+        Floating point type of the axis
+
+    Returns
+    -------
+    freq : np.ndarray
+        Read-only frequency bins of length n//2 + 1
+    """
+    freq = np.fft.rfftfreq(n, d=1/fs).astype(dtype)
+    freq.setflags(write=False)
+    return freq
+
+def rpm_bucket(rpm, step=RPM_BUCKET):
+    """
+    RPM 값을 step 단위로 반올림하여 고조파 인덱스 캐시 키로 사용 (None/NaN/0 이하이면 기본 RPM)
+
+    Parameters
+    ----------
+    rpm : float or None
+        Rotating speed of the window
+    step : int
+        Bucket width in RPM
+
+    Returns
+    -------
+    bucket : int
+        Quantized RPM
+    """
+    try:
+        rpm = float(rpm)
+    except (TypeError, ValueError):
+        rpm = RPM
+    if not np.isfinite(rpm) or rpm <= 0:
+        rpm = RPM
+    return int(round(rpm / step) * step)
+
+@lru_cache(maxsize=256)
+def harmonic_index(n, fs, rpm=RPM, orders=HARMONIC_ORDERS):
+    """
+    (n, fs, rpm) 조합별로 1x ~ orders x 고조파에 가장 가까운 양의 주파수 FFT 빈 인덱스를 계산하여 캐시
+
+    Parameters
+    ----------
+    n : int
+        Signal length
+    fs : int
+        Sampling frequency
+    rpm : int
+        Rotating speed (bucketed by rpm_bucket)
+    orders : int
+        Number of harmonics
+
+    Returns
+    -------
+    idx : np.ndarray
+        Read-only bin indices of shape (orders,)
+    """
+    fundamental = rpm / 60
+    freq_positive = np.fft.fftfreq(n, d=1/fs)[:n//2]
+    targets = fundamental * np.arange(1, orders + 1)
+    idx = np.argmin(np.abs(freq_positive[np.newaxis, :] - targets[:, np.newaxis]), axis=1)
+    idx.setflags(write=False)
+    return idx
+
+def harmonic_bins(n, fs, rpm=None, orders=HARMONIC_ORDERS):
+    """
+    구간별 RPM에 대한 고조파 빈 인덱스 테이블 생성. RPM은 버킷 단위로 묶어 고유 버킷별로 한 번만 조회
+
+    Parameters
+    ----------
+    n : int
+        Signal length
+    fs : int
+        Sampling frequency
+    rpm : float, array-like or None
+        Single RPM for all windows, or per-window RPMs of shape (n_windows,)
+    orders : int
+        Number of harmonics
+
+    Returns
+    -------
+    idx : np.ndarray
+        Bin indices of shape (orders,) for a single RPM, or (n_windows, orders) for per-window RPMs
+    """
+    if rpm is None or np.ndim(rpm) == 0:
+        return harmonic_index(n, fs, rpm_bucket(rpm), orders)
+    buckets = np.array([rpm_bucket(r) for r in np.asarray(rpm, dtype=np.float64)])
+    uniques, inverse = np.unique(buckets, return_inverse=True)
+    table = np.stack([harmonic_index(n, fs, int(b), orders) for b in uniques])
+    return table[inverse]
+
+def harmonic_amplitudes(spectrum, rpm=None, orders=HARMONIC_ORDERS):
+    """
+    스펙트럼 컨텍스트에서 1x ~ orders x 고조파 진폭을 한 번의 인덱싱으로 추출
+
+    Parameters
+    ----------
+    spectrum : spectralContext
+        Spectral context of a window or a signal matrix
+    rpm : float, array-like or None
+        Single RPM, or per-window RPMs for a signal matrix
+    orders : int
+        Number of harmonics
+
+    Returns
+    -------
+    idx : np.ndarray
+        Harmonic bin indices, (orders,) or (n_windows, orders)
+    amp : np.ndarray
+        Harmonic amplitudes, (orders,) or (n_windows, orders)
+    """
+    idx = harmonic_bins(spectrum.n, spectrum.fs, rpm, orders)
+    if idx.ndim == 1:
+        return idx, spectrum.mag[..., idx]
+    return idx, np.take_along_axis(spectrum.mag, idx, axis=-1)
+
+@lru_cache(maxsize=64)
+def band_slice(n, fs, low, high):
+    """
+    단측 주파수 축에서 low <= freq <= high 구간에 해당하는 빈 범위를 slice로 계산하여 캐시
+
+    Parameters
+    ----------
+    n : int
+        Signal length
+    fs : int
+        Sampling frequency
+    low, high : float
+        Band edges in Hz (inclusive)
+
+    Returns
+    -------
+    band : slice
+        Bin range of the band in the rfft spectrum
+    """
+    freq = rfft_freq(n, fs)
+    return slice(int(np.searchsorted(freq, low, side='left')), int(np.searchsorted(freq, high, side='right')))
+
+def band_mean(spectrum, low=NOISE_BAND[0], high=NOISE_BAND[1]):
+    """
+    주파수 대역(low~high Hz) 내 평균 진폭 계산
+
+    Parameters
+    ----------
+    spectrum : spectralContext
+        Spectral context of a window or a signal matrix
+    low, high : float
+        Band edges in Hz (inclusive)
+
+    Returns
+    -------
+    mean_amp : float or np.ndarray
+        Mean amplitude in the band, per window for a signal matrix
+    """
+    return spectrum.mag[..., band_slice(spectrum.n, spectrum.fs, low, high)].mean(axis=-1)
+
+def envelope_over_threshold(spectrum, threshold=ENV_THRESHOLD):
+    """
+    포락선 스펙트럼에서 진폭이 임곗값을 넘는 주파수 빈 수 계산
+
+    Parameters
+    ----------
+    spectrum : spectralContext
+        Spectral context of a window or a signal matrix
+    threshold : float
+        Amplitude threshold
+
+    Returns
+    -------
+    num_over : int or np.ndarray
+        Number of bins exceeding threshold, per window for a signal matrix
+    """
+    return np.count_nonzero(spectrum.env_mag > threshold, axis=-1)
+
+class spectralContext:
+    """
+    시계열 구간(1-D) 또는 구간 행렬(2-D, 마지막 축이 시간)에 대해 FFT를 한 번만 수행하고,
+    주파수 특징(중심/대역폭/피크, 고조파, 베어링 노이즈, 포락선)이 공통으로 읽어 쓰는 스펙트럼 컨텍스트.
+    진폭/포락선 스펙트럼은 처음 접근할 때 한 번만 계산. float32 신호는 float32/complex64로 계산.
+
+    Parameters
+    ----------
+    signal : np.ndarray
+        Time-domain signal of shape (window_size,) or (n_windows, window_size)
+    fs : int
+        Sampling frequency
+
+    Attributes
+    ----------
+    n : int
+        Window length
+    freq : np.ndarray
+        One-sided frequency bins (n//2 + 1)
+    mag : np.ndarray
+        One-sided magnitude spectrum |rfft(signal)|
+    env_freq : np.ndarray
+        Frequency bins of the envelope spectrum (n//2)
+    env_mag : np.ndarray
+        Magnitude spectrum of the Hilbert envelope (n//2 bins)
+    """
+    def __init__(self, signal, fs=12800):
+        self.signal = np.asarray(signal)
+        self.fs = fs
+        self.n = self.signal.shape[-1]
+        self._mag = None
+        self._env_mag = None
+
+    @property
+    def mag(self):
+        if self._mag is None:
+            self._mag = np.abs(sp_fft.rfft(self.signal, axis=-1))
+        return self._mag
+
+    @property
+    def freq(self):
+        return rfft_freq(self.n, self.fs, np.result_type(self.signal.dtype, np.float32).type)
+
+    @property
+    def env_freq(self):
+        return self.freq[:self.n // 2]
+
+    @property
+    def env_mag(self):
+        if self._env_mag is None:
+            envelope = np.abs(hilbert(self.signal, axis=-1))
+            self._env_mag = np.abs(sp_fft.rfft(envelope, axis=-1))[..., :self.n // 2]
+        return self._env_mag
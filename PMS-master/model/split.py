@@ -1,51 +1,188 @@
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
-
-X_FILTER = [
-    'time_rms', 'time_skewness', 'time_kurtosis', 'time_crest_factor',
-    'time_shape_factor', 'time_mean', 'time_std', 'time_peak',
-    'time_mean_diff', 'time_std_diff', 'time_min_diff', 'time_max_diff',
-    'fft_centroid', 'fft_bandwidth', 'fft_peak_freq', 'fft_over_env',
-    'fft_amp_1x', 'fft_amp_2x', 'fft_amp_3x', 'fft_amp_4x', 'fft_amp_5x', 
-    'cD1_rms', 'cD1_kurtosis', 'cD2_rms', 'cD2_kurtosis', 
-    'cD3_rms', 'cD3_kurtosis', 'cD4_rms', 'cD4_kurtosis', 
-    'cD5_rms', 'cD5_kurtosis', 'cD6_rms', 'cD6_kurtosis', 
-    'cD7_rms', 'cD7_kurtosis', 'normal', 'anomaly',
-    'bearing', 'misalignment', 'unbalance', 'rotor', 'cavitation',
-    'real_normal'
-]
+from sklearn.model_selection import train_test_split, KFold, StratifiedKFold
+
+from model.registry import X_FILTER as FEATURE_FILTER, LABEL_COLUMNS
+from model.feature_store import DATASET_DIR, read_feature_dataset
+
+# 특징 + 라벨 컬럼 (vane 라벨 제외)
+X_FILTER = FEATURE_FILTER + [col for col in LABEL_COLUMNS if col != 'vane']
 Y_FILTER = ['real_normal']
 
-ALL_FILTER = [
-    'time_rms', 'time_skewness', 'time_kurtosis', 'time_crest_factor',
-    'time_shape_factor', 'time_mean', 'time_std', 'time_peak',
-    'time_mean_diff', 'time_std_diff', 'time_min_diff', 'time_max_diff',
-    'fft_centroid', 'fft_bandwidth', 'fft_peak_freq', 'fft_over_env',
-    'fft_amp_1x', 'fft_amp_2x', 'fft_amp_3x', 'fft_amp_4x', 'fft_amp_5x', 
-    'cD1_rms', 'cD1_kurtosis', 'cD2_rms', 'cD2_kurtosis', 
-    'cD3_rms', 'cD3_kurtosis', 'cD4_rms', 'cD4_kurtosis', 
-    'cD5_rms', 'cD5_kurtosis', 'cD6_rms', 'cD6_kurtosis', 
-    'cD7_rms', 'cD7_kurtosis', 'normal', 'anomaly',
-    'bearing', 'misalignment', 'unbalance', 'rotor', 'cavitation',
-    'real_normal'
-]
+ALL_FILTER = list(X_FILTER)
+
+NORMAL_HOLDOUT = 0.2  # 평가용으로 남겨두는 정상 구간 비율
+SEED = 42
+
+def class_codes(df):
+    """
+    층화(stratify)용 결함 클래스 코드. 'target' 컬럼이 있으면 그대로, 없으면 라벨 컬럼 조합으로 구분
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Feature dataframe with 'target' or label columns
+
+    Returns
+    -------
+    codes : np.ndarray
+        Integer class code per row
+    """
+    if 'target' in df.columns:
+        return pd.factorize(df['target'])[0]
+    label_cols = [col for col in LABEL_COLUMNS if col in df.columns]
+    _, codes = np.unique(df[label_cols].to_numpy(), axis=0, return_inverse=True)
+    return codes.ravel()
+
+def _holdout(idx, normal_holdout, seed):
+    if normal_holdout <= 0 or len(idx) < 2:
+        return idx, idx[:0]
+    return train_test_split(idx, test_size=normal_holdout, random_state=seed)
+
+def split_indices(df, normal_holdout=NORMAL_HOLDOUT, seed=SEED):
+    """
+    정상 구간 중 normal_holdout 비율을 평가용으로 떼어 두고 나머지를 학습용으로 사용하는 인덱스 분할.
+    평가용은 떼어 둔 정상 구간 + 모든 비정상 구간이며, 학습 구간은 포함하지 않음
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Feature dataframe with a 'real_normal' column
+    normal_holdout : float
+        Fraction of normal rows held out for evaluation
+    seed : int
+        Random seed (same seed, same split)
+
+    Returns
+    -------
+    train_idx : np.ndarray
+        Positional indices of training rows (normal only)
+    test_idx : np.ndarray
+        Shuffled positional indices of evaluation rows
+    """
+    normal = df['real_normal'].to_numpy() == 1
+    train_idx, held_idx = _holdout(np.flatnonzero(normal), normal_holdout, seed)
+    test_idx = np.random.default_rng(seed).permutation(np.concatenate([held_idx, np.flatnonzero(~normal)]))
+    return np.sort(train_idx), test_idx
+
+def stratified_indices(df, test_size=0.2, seed=SEED):
+    """
+    결함 클래스 비율을 유지하는 일반 학습/평가 인덱스 분할
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Feature dataframe with 'target' or label columns
+    test_size : float
+        Fraction of rows in the evaluation split
+    seed : int
+        Random seed
+
+    Returns
+    -------
+    train_idx, test_idx : np.ndarray
+        Positional indices of each split
+    """
+    idx = np.arange(len(df))
+    return train_test_split(idx, test_size=test_size, random_state=seed, stratify=class_codes(df))
+
+def kfold_indices(df, n_splits=5, seed=SEED, normal_only=True):
+    """
+    k-fold 인덱스 생성기.
+    normal_only=True이면 정상 구간만 fold로 나누고, 각 fold의 평가용은 해당 fold의 정상 구간 + 모든 비정상 구간.
+    normal_only=False이면 전체 구간을 결함 클래스로 층화하여 나눔
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Feature dataframe with 'real_normal' and 'target' or label columns
+    n_splits : int
+        Number of folds
+    seed : int
+        Random seed of the fold assignment
+    normal_only : bool
+        Fold over normal rows only (AutoEncoder training)
+
+    Yields
+    ------
+    train_idx : np.ndarray
+        Positional indices of training rows
+    test_idx : np.ndarray
+        Positional indices of evaluation rows
+    """
+    if normal_only:
+        normal = df['real_normal'].to_numpy() == 1
+        normal_idx = np.flatnonzero(normal)
+        anomaly_idx = np.flatnonzero(~normal)
+        for train_pos, test_pos in KFold(n_splits=n_splits, shuffle=True, random_state=seed).split(normal_idx):
+            yield normal_idx[train_pos], np.concatenate([normal_idx[test_pos], anomaly_idx])
+    else:
+        codes = class_codes(df)
+        for train_idx, test_idx in StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed).split(codes, codes):
+            yield train_idx, test_idx
 
-def split_data(df):
+def split_data(df, normal_holdout=NORMAL_HOLDOUT, seed=SEED):
     """
-    정상인 데이터를 학습용으로 사용하고, 전체 데이터를 섞어 평가용 데이터셋으로 구성함.
+    정상인 데이터를 학습용으로 사용하고, 학습에 쓰지 않은 구간을 섞어 평가용 데이터셋으로 구성함.
+    (split_indices의 인덱스로 행을 선택; 큰 특징 행렬은 split_indices를 직접 사용해 복사를 피할 것)
 
     Parameters
     ----------
     df : pandas.DataFrame
         Full feature dataframe after preprocessing
-    
+    normal_holdout : float
+        Fraction of normal rows held out for evaluation
+    seed : int
+        Random seed
+
     Returns
     -------
     train_df : pandas.DataFrame
         Subset of df where normal dataset (used for training)
     test_df : pandas.DataFrame
-        Shuffled full dataset (used for evaluation or inference)
+        Shuffled held-out normal + abnormal rows (used for evaluation or inference)
+    """
+    train_idx, test_idx = split_indices(df, normal_holdout, seed)
+    train_df = df.iloc[train_idx].reset_index(drop=True)
+    test_df = df.iloc[test_idx].reset_index(drop=True)
+    return train_df, test_df
+
+def split_dataset(path=DATASET_DIR, train_columns=FEATURE_FILTER, test_columns=None, normal_holdout=NORMAL_HOLDOUT, seed=SEED):
+    """
+    split_data와 같은 분할을 Parquet 특징 데이터셋에서 직접 읽어 구성.
+    정상 구간은 real_normal==1 조건 pushdown으로 normal 파티션만 읽어 split_data와 같은 규칙으로 나누고,
+    비정상 구간은 평가용 컬럼만 읽음
+
+    Parameters
+    ----------
+    path : str
+        Root directory of the feature dataset (model.feature_store)
+    train_columns : list of str
+        Columns read for training
+    test_columns : list of str, optional
+        Columns read for evaluation (default: all; [] skips the abnormal partitions and returns an empty test_df)
+    normal_holdout : float
+        Fraction of normal rows held out for evaluation
+    seed : int
+        Random seed
+
+    Returns
+    -------
+    train_df : pandas.DataFrame
+        Normal training rows, train_columns
+    test_df : pandas.DataFrame
+        Shuffled held-out normal + abnormal rows, test_columns
     """
-    train_df = df[df.real_normal==1].reset_index(drop=True)
-    test_df = df.sample(frac=1).reset_index(drop=True)
+    normal_columns = None if test_columns is None else list(dict.fromkeys(list(train_columns) + list(test_columns)))
+    normal_df = read_feature_dataset(path, columns=normal_columns, targets=['normal'], filters={'real_normal': 1})
+    train_pos, held_pos = _holdout(np.arange(len(normal_df)), normal_holdout, seed)
+    train_df = normal_df.iloc[np.sort(train_pos)][list(train_columns)].reset_index(drop=True)
+    if test_columns is not None and len(test_columns) == 0:
+        # 평가용 컬럼이 없으면 (학습만 하는 경우) 비정상 파티션을 읽지 않음
+        return train_df, pd.DataFrame()
+
+    other_df = read_feature_dataset(path, columns=test_columns, filters={'real_normal': 0})
+    held_df = normal_df.iloc[held_pos][list(other_df.columns)]
+    test_df = pd.concat([held_df, other_df], ignore_index=True)
+    test_df = test_df.iloc[np.random.default_rng(seed).permutation(len(test_df))].reset_index(drop=True)
     return train_df, test_df
@@ -0,0 +1,55 @@
+import pywt
+import numpy as np
+
+WAVELET = 'db4'
+DWT_LEVEL = 7
+DWT_BANDS = 7  # X_FILTER에 고정된 cD1 ~ cD7 컬럼 수
+
+DWT_COLUMNS = [f'cD{i}_{stat}' for i in range(1, DWT_BANDS + 1) for stat in ('rms', 'kurtosis')]
+
+def dwt_kernel(windows, wavelet=WAVELET, level=DWT_LEVEL, axis=-1, out=None):
+    """
+    신호 행렬 전체를 지정한 축으로 한 번에 다중 레벨 웨이블릿 분해하고,
+    cD1~cD7 계수의 RMS 및 첨도(Fisher, 편향 추정)를 벡터 연산으로 계산.
+
+    컬럼 배치는 level과 무관하게 DWT_COLUMNS(cD1~cD7)로 고정되며,
+    cD1은 7레벨 상세 계수, cD7은 1레벨 상세 계수에 대응 (기존 db4/level=7 결과와 동일).
+    level이 7보다 작으면 존재하지 않는 레벨의 컬럼은 NaN, 크면 7레벨보다 거친 계수는 사용하지 않음.
+
+    Parameters
+    ----------
+    windows : np.ndarray
+        Signal matrix, time along `axis`
+    wavelet : str
+        Wavelet name
+    level : int
+        Decomposition level
+    axis : int
+        Time axis of `windows`
+    out : np.ndarray, optional
+        Preallocated output of shape (n_windows, len(DWT_COLUMNS)); may be a column slice of a feature matrix
+
+    Returns
+    -------
+    out : np.ndarray
+        RMS/kurtosis matrix, columns ordered as DWT_COLUMNS
+    """
+    windows = np.moveaxis(np.atleast_2d(windows), axis, -1)
+    if out is None:
+        out = np.empty((windows.shape[0], len(DWT_COLUMNS)), dtype=np.result_type(windows.dtype, np.float32))
+
+    coeffs = pywt.wavedec(windows, wavelet, level=level, axis=-1)
+    for i in range(1, DWT_BANDS + 1):
+        pos = level - DWT_BANDS + i  # coeffs[pos]: 상세 계수 레벨 (DWT_BANDS + 1 - i)
+        if pos < 1:
+            out[:, 2*(i-1)] = np.nan
+            out[:, 2*(i-1) + 1] = np.nan
+            continue
+        c = coeffs[pos]
+        centered = c - c.mean(axis=-1, keepdims=True)
+        m2 = np.mean(centered**2, axis=-1)
+        m4 = np.mean(centered**4, axis=-1)
+        out[:, 2*(i-1)] = np.sqrt(np.mean(c**2, axis=-1))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out[:, 2*(i-1) + 1] = m4 / m2**2 - 3.0
+    return out
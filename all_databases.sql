@@ -37463,6 +37463,13 @@ INSERT INTO `newtrain_table` VALUES
 /*!40000 ALTER TABLE `newtrain_table` ENABLE KEYS */;
 UNLOCK TABLES;
 
+--
+-- Add an auto-increment key to `newtrain_table` (incremental retrain watermark).
+-- Rows get keys in stored order; the data above is loaded first because its INSERTs are positional.
+--
+
+ALTER TABLE `newtrain_table` ADD COLUMN `id` int(11) NOT NULL AUTO_INCREMENT PRIMARY KEY FIRST;
+
 --
 -- Table structure for table `pms_ai_advice`
 --
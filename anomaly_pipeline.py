@@ -8,7 +8,10 @@ _last_llm_ts = 0.0
 
 from rag_assist import rag_recommend_devices
 
+import fcntl
+import json
 import os
+import subprocess
 import sys
 import time
 from contextlib import contextmanager
@@ -21,12 +24,8 @@ import joblib
 import numpy as np
 import pandas as pd
 import pymysql
-import torch
-import torch.nn as nn
-import torch.optim as optim
 from dotenv import load_dotenv
 from pymysql.cursors import DictCursor
-from torch.utils.data import DataLoader
 
 load_dotenv()
 
@@ -36,28 +35,44 @@ AUTO_ENCODER_DIR = PMS_MASTER_DIR / "auto_encoder"
 NEW_MODEL_DIR = ROOT_DIR / "new_model"
 DEFAULT_MODEL_PATH = AUTO_ENCODER_DIR / "normal_train.model"
 DEFAULT_SCALER_PATH = AUTO_ENCODER_DIR / "scaler.joblib"
+ENGINE_NAME = "autoencoder.npz"  # NumPy 추론 엔진 아티팩트 (가중치 + LayerNorm + 스케일러 통계)
 
 if not PMS_MASTER_DIR.exists():
     raise FileNotFoundError(f"PMS-master 디렉터리를 찾을 수 없습니다: {PMS_MASTER_DIR}")
 
 sys.path.insert(0, str(PMS_MASTER_DIR))
-sys.path.insert(0, str(AUTO_ENCODER_DIR))
 
+# 추론은 NumPy 엔진만 사용하고, torch/sklearn은 학습·변환 함수 안에서만 import한다.
 try:
-    from auto_encoder.make_torch import X_FILTER, df2torch, stdScaling
-    from auto_encoder.model import AutoEncoder
+    from model.registry import X_FILTER
+    from auto_encoder.numpy_engine import export_npz, numpyAutoEncoder, read_source_hash, source_hash
 except ModuleNotFoundError as exc:  # pragma: no cover
     raise ImportError(
         "auto_encoder 모듈을 불러올 수 없습니다. PMS-master 경로를 확인하세요."
     ) from exc
 
 
-DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 HIDDEN_DIM = 32
 LATENT_DIM = 8
 BATCH_SIZE = 8
 NUM_EPOCHS = 100
 LEARNING_RATE = 5e-3
+TRAIN_MODE = os.getenv("PMS_TRAIN_MODE", "loader")  # loader: 기존 DataLoader, tensor: 메모리 내 텐서 + 큰 배치 (비교용)
+FAST_BATCH_SIZE = 256
+VALIDATION_FRACTION = 0.2  # 재학습 시 검증용으로 떼어 두는 newtrain_table 비율
+EARLY_STOP_PATIENCE = 10
+SPLIT_SEED = 42
+RETRAIN_MODE = os.getenv("PMS_RETRAIN_MODE", "incremental")  # incremental: 워터마크 이후 행 + replay로 이어서 학습, full: 전체 재학습
+FINETUNE_EPOCHS = 30
+FINETUNE_LR_RATIO = 0.2  # 이어서 학습할 때 LEARNING_RATE 배수
+REPLAY_SIZE = 2000  # 과거 행 replay 표본(저수지 샘플링) 최대 크기
+NEWTRAIN_KEY = "id"  # newtrain_table에 없으면 추가하는 auto-increment 기본 키 (증분 재학습 워터마크)
+RETRAIN_STATE_PATH = NEW_MODEL_DIR / "retrain_state.json"
+REPLAY_PATH = NEW_MODEL_DIR / "replay.npy"
+RETRAIN_THREADS = int(os.getenv("PMS_RETRAIN_THREADS", "1"))  # 재학습 워커 프로세스의 CPU 스레드 수
+RETRAIN_LOCK_PATH = NEW_MODEL_DIR / ".retrain.lock"
+RETRAIN_PENDING_PATH = NEW_MODEL_DIR / ".retrain.pending"
+PUBLISHED_PATH = NEW_MODEL_DIR / "published.json"
 ANOMALY_THRESHOLD = 50.0  # MAE 기준
 SLEEP_SECONDS = 60
 DROP_TAIL_COLUMNS = 9
@@ -81,6 +96,49 @@ def resolve_scaler_path() -> Path:
     raise FileNotFoundError("사용 가능한 스케일러 파일을 찾지 못했습니다.")
 
 
+def resolve_engine_path() -> Path:
+    """
+    torch 모델과 같은 우선순위(new_model → PMS-master)로 NumPy 엔진 경로를 찾는다.
+    엔진에 기록된 source_hash가 같은 디렉터리의 모델/스케일러 내용과 같으면 그대로 사용하고 (torch 불필요),
+    엔진이 없거나 다른 아티팩트에서 변환된 경우에만 한 번 다시 변환한다 (이때만 torch 필요).
+    """
+    for directory in (NEW_MODEL_DIR, AUTO_ENCODER_DIR):
+        engine_path = directory / ENGINE_NAME
+        model_path = directory / "normal_train.model"
+        scaler_path = directory / "scaler.joblib"
+        has_source = model_path.exists() and scaler_path.exists()
+        if engine_path.exists() and (
+            not has_source or read_source_hash(engine_path) == source_hash(model_path, scaler_path)
+        ):
+            return engine_path
+        if has_source:
+            export_engine(directory)
+            return engine_path
+    raise FileNotFoundError("사용 가능한 AutoEncoder 추론 엔진(.npz)이나 가중치 파일을 찾지 못했습니다.")
+
+
+def export_engine(directory: Path) -> Path:
+    """directory의 normal_train.model / scaler.joblib을 NumPy 엔진(.npz)으로 변환해 같은 곳에 저장한다."""
+    try:
+        import torch
+        from auto_encoder.model import autoencoder_from_state
+    except ModuleNotFoundError as exc:
+        raise RuntimeError(
+            f"{directory / ENGINE_NAME}이(가) 없거나 모델/스케일러와 맞지 않아 다시 변환해야 하지만 torch가 없습니다. "
+            "torch가 있는 환경에서 python -m auto_encoder.numpy_engine으로 변환하세요."
+        ) from exc
+
+    # 차원은 state_dict에서 읽음 (sweep 1위 설정처럼 HIDDEN_DIM/LATENT_DIM과 달라도 변환 가능)
+    model = autoencoder_from_state(torch.load(directory / "normal_train.model", map_location="cpu"))
+    engine_path = directory / ENGINE_NAME
+    export_npz(
+        model, joblib.load(directory / "scaler.joblib"), engine_path.with_suffix(".tmp"), X_FILTER,
+        source=source_hash(directory / "normal_train.model", directory / "scaler.joblib"),
+    )
+    os.replace(engine_path.with_suffix(".tmp"), engine_path)
+    return engine_path
+
+
 def _get_db_config() -> Dict[str, str]:
     """Collect database connection parameters from environment variables."""
     config = {
@@ -229,14 +287,45 @@ def _to_float(value: object) -> float:
         raise ValueError(f"숫자로 변환할 수 없습니다: {value!r}") from exc
 
 
-def prepare_feature_dataframe(row: Dict[str, object]) -> pd.DataFrame:
-    """Convert a realtime_table row into a DataFrame aligned with X_FILTER."""
+def prepare_feature_vector(row: Dict[str, object]) -> np.ndarray:
+    """Convert a realtime_table row into a float vector aligned with X_FILTER (no DataFrame per request)."""
     missing = [col for col in X_FILTER if col not in row]
     if missing:
         raise KeyError(f"realtime_table에 다음 컬럼이 없습니다: {', '.join(missing)}")
 
-    values = [_to_float(row[col]) for col in X_FILTER]
-    return pd.DataFrame([values], columns=X_FILTER)
+    return np.array([_to_float(row[col]) for col in X_FILTER])
+
+
+_loaded_stamp: Optional[int] = None
+
+
+def refresh_model_if_published() -> bool:
+    """
+    재학습 워커(별도 프로세스)가 새 아티팩트를 게시했으면 캐시된 모델/스케일러를 비운다.
+    게시 표식(published.json)은 모델/스케일러 교체가 모두 끝난 뒤에 쓰이므로, 그 전까지는 기존 모델로 계속 추론한다.
+    """
+    global _loaded_stamp
+    stamp = PUBLISHED_PATH.stat().st_mtime_ns if PUBLISHED_PATH.exists() else None
+    if stamp == _loaded_stamp:
+        return False
+    _loaded_stamp = stamp
+    load_engine.cache_clear(); load_scaler.cache_clear(); load_model.cache_clear()
+    return True
+
+
+@lru_cache(maxsize=1)
+def load_engine() -> numpyAutoEncoder:
+    engine = numpyAutoEncoder(resolve_engine_path())
+    if engine.columns is not None and engine.columns != X_FILTER:
+        raise ValueError("추론 엔진의 입력 컬럼 순서가 X_FILTER와 다릅니다. 엔진을 다시 변환하세요.")
+    return engine
+
+
+@lru_cache(maxsize=1)
+def _device():
+    import torch
+
+    return torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
 
 @lru_cache(maxsize=1)
@@ -247,53 +336,52 @@ def load_scaler():
 
 @lru_cache(maxsize=1)
 def load_model():
+    import torch
+    from auto_encoder.model import autoencoder_from_state
+
     model_path = resolve_model_path()
-    model = AutoEncoder(len(X_FILTER), HIDDEN_DIM, LATENT_DIM)
-    state_dict = torch.load(model_path, map_location=DEVICE)
-    model.load_state_dict(state_dict)
-    model.to(DEVICE)
+    model = autoencoder_from_state(torch.load(model_path, map_location=_device()))
+    model.to(_device())
     model.eval()
     return model
 
 
-def run_autoencoder_inference(row: Dict[str, object]) -> Dict[str, np.ndarray]:
+def run_autoencoder_inference(row: Dict[str, object], detail: bool = False) -> Dict[str, np.ndarray]:
     """
     단일 샘플에 대해 AutoEncoder 추론을 수행하고 결과를 반환.
+    스케일러를 첫/마지막 Linear에 접어 넣은 NumPy 엔진으로 원 단위 특징에서 바로
+    mae_original, mse_original, mse_scaled, latent_vector를 계산한다 (요청마다 pandas/sklearn 호출 없음).
+    detail=True이면 스케일/원 단위 입력·복원값·차이도 함께 반환한다.
     """
-    feature_df = prepare_feature_dataframe(row)
-    scaler = load_scaler()
-    scaled_array = scaler.scaling(feature_df)
-    scaled_df = pd.DataFrame(scaled_array, columns=X_FILTER)
-
-    tensor = df2torch(scaled_df).to(DEVICE)
-    model = load_model()
-
-    with torch.no_grad():
-        latent, recon = model(tensor)
-
-    scaled_input = tensor.cpu().numpy()[0]
-    scaled_recon = recon.cpu().numpy()[0]
-    scaled_diff = scaled_input - scaled_recon
-    latent_vec = latent.cpu().numpy()[0]
-    mse_scaled = float(np.mean(scaled_diff ** 2))
-
-    original_input = scaler.scaler.inverse_transform(scaled_input.reshape(1, -1))[0]
-    original_recon = scaler.scaler.inverse_transform(scaled_recon.reshape(1, -1))[0]
-    original_diff = original_input - original_recon
-    mse_original = float(np.mean(original_diff ** 2))
-    mae_original = float(np.mean(np.abs(original_diff)))
+    features = prepare_feature_vector(row)
+    refresh_model_if_published()
+    engine = load_engine()
+    if not detail:
+        out = engine.score_errors(features)
+        return {
+            "latent_vector": out["latent_vector"][0],
+            "mse_scaled": float(out["mse_scaled"][0]),
+            "mse_original": float(out["mse_original"][0]),
+            "mae_original": float(out["mae_original"][0]),
+        }
+
+    out = engine.score(features)
+    scaled_input = out["scaled_input"][0]
+    scaled_recon = out["scaled_reconstruction"][0]
+    original_input = out["original_input"][0]
+    original_recon = out["original_reconstruction"][0]
 
     return {
         "scaled_input": scaled_input,
         "scaled_reconstruction": scaled_recon,
-        "scaled_difference": scaled_diff,
+        "scaled_difference": scaled_input - scaled_recon,
         "original_input": original_input,
         "original_reconstruction": original_recon,
-        "original_difference": original_diff,
-        "latent_vector": latent_vec,
-        "mse_scaled": mse_scaled,
-        "mse_original": mse_original,
-        "mae_original": mae_original,
+        "original_difference": original_input - original_recon,
+        "latent_vector": out["latent_vector"][0],
+        "mse_scaled": float(out["mse_scaled"][0]),
+        "mse_original": float(out["mse_original"][0]),
+        "mae_original": float(out["mae_original"][0]),
     }
 
 
@@ -313,31 +401,81 @@ def insert_ai_result(result_flag: int) -> None:
             cursor.execute(query, (result_flag,))
         conn.commit()
 
-def load_newtrain_features() -> pd.DataFrame:
+class NoNewRowsError(ValueError):
+    """증분 재학습 워터마크 이후 newtrain_table에 새 행이 없음 (재학습을 건너뜀)."""
+
+
+def _newtrain_columns() -> List[Dict[str, object]]:
+    with _db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SHOW COLUMNS FROM newtrain_table;")
+            return cur.fetchall()
+
+
+def _auto_increment_key(columns: List[Dict[str, object]]) -> Optional[str]:
+    """SHOW COLUMNS 결과에서 auto-increment 기본 키 컬럼 이름을 찾는다 (없으면 None)."""
+    for col in columns:
+        if col.get("Key") == "PRI" and "auto_increment" in str(col.get("Extra", "")).lower():
+            return str(col["Field"])
+    return None
+
+
+def ensure_newtrain_key() -> Optional[str]:
+    """
+    newtrain_table의 auto-increment 기본 키(증분 재학습 워터마크 기준) 이름을 돌려준다.
+    키가 없는 예전 스키마면 `id INT AUTO_INCREMENT PRIMARY KEY`를 추가하는 마이그레이션을 시도하고
+    (기존 행에는 저장 순서대로 키가 매겨짐), 권한 부족 등으로 실패하면 None (전체 재학습만 가능).
+    """
+    key = _auto_increment_key(_newtrain_columns())
+    if key is not None:
+        return key
+    try:
+        with _db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"ALTER TABLE newtrain_table ADD COLUMN `{NEWTRAIN_KEY}` INT AUTO_INCREMENT PRIMARY KEY FIRST;")
+            conn.commit()
+    except pymysql.MySQLError as exc:
+        print(f"[재학습] newtrain_table에 {NEWTRAIN_KEY} 키를 추가하지 못했습니다: {exc}")
+        return None
+    return _auto_increment_key(_newtrain_columns())
+
+
+def load_newtrain_features(after_id: Optional[int] = None, key: Optional[str] = None) -> pd.DataFrame:
     """
     newtrain_table에서 재학습용 피처를 '그대로' 읽는다.
     - pandas.read_sql 대신 cursor.fetchall()로 안전하게 가져옴
     - 전 컬럼 numeric dtype 강제 확인
+    - key(auto-increment 기본 키)가 주어지면 키 순서로 읽고 마지막 키를 df.attrs["last_id"]에 기록,
+      after_id도 주어지면 그 키보다 큰 행만 읽음 (증분 재학습, 새 행이 없으면 NoNewRowsError)
     """
     # 1) 컬럼 존재 확인
-    with _db_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute("SHOW COLUMNS FROM newtrain_table;")
-            existing_cols = [row["Field"] for row in cur.fetchall()]
+    existing_cols = [row["Field"] for row in _newtrain_columns()]
     missing = [c for c in X_FILTER if c not in existing_cols]
     if missing:
         raise KeyError(f"newtrain_table에서 다음 컬럼을 찾을 수 없습니다: {', '.join(missing)}")
+    if after_id is not None and key is None:
+        raise ValueError("after_id로 읽으려면 newtrain_table의 auto-increment 키가 필요합니다.")
 
     # 2) SELECT (그대로)
-    select_list = ", ".join(f"`{c}`" for c in X_FILTER)
-    query = f"SELECT {select_list} FROM newtrain_table;"
+    if key is None:
+        query, params = f"SELECT {', '.join(f'`{c}`' for c in X_FILTER)} FROM newtrain_table;", ()
+    else:
+        select_list = ", ".join(f"`{c}`" for c in [key] + X_FILTER)
+        # LIMIT offset은 ORDER BY 없이는 순서가 보장되지 않으므로 키 순서로 워터마크 이후 행만 가져옴
+        if after_id is None:
+            query, params = f"SELECT {select_list} FROM newtrain_table ORDER BY `{key}`;", ()
+        else:
+            query, params = f"SELECT {select_list} FROM newtrain_table WHERE `{key}` > %s ORDER BY `{key}`;", (after_id,)
 
     with _db_connection() as conn:
         with conn.cursor() as cur:
-            cur.execute(query)
+            cur.execute(query, params)
             rows = cur.fetchall()              # list[dict]
     if not rows:
+        if after_id is not None:
+            raise NoNewRowsError(f"newtrain_table에 {key} {after_id} 이후 새 데이터가 없습니다.")
         raise ValueError("newtrain_table에 데이터가 없습니다.")
+    last_id = int(rows[-1][key]) if key is not None else None
 
     # 3) DataFrame 구성 (열 순서 고정)
     df = pd.DataFrame(rows, columns=X_FILTER)
@@ -360,7 +498,9 @@ def load_newtrain_features() -> pd.DataFrame:
 
     if df.empty:
         raise ValueError("newtrain_table에 유효한 숫자 데이터가 없습니다.")
-    return df.reset_index(drop=True)
+    df = df.reset_index(drop=True)
+    df.attrs["last_id"] = last_id
+    return df
 
 
 def main_loop(interval_seconds: int = SLEEP_SECONDS) -> None:
@@ -395,9 +535,9 @@ def main_loop(interval_seconds: int = SLEEP_SECONDS) -> None:
                 anomaly_streak = 0
 
             if anomaly_streak >= 3:
-                print("[파이프라인] 이상 징후 3회 연속 감지 → 재학습을 실행합니다.")
-                # retrain_autoencoder_from_newtrain()
-                run_retrain_with_logging()
+                # 재학습은 별도 프로세스에서 수행하고, 새 모델이 게시될 때까지 현재 모델로 계속 판정
+                status = trigger_retrain_async()
+                print(f"[파이프라인] 이상 징후 3회 연속 감지 → 재학습 요청 ({status})")
                 anomaly_streak = 0
 
             row_offset += 1
@@ -483,49 +623,327 @@ def _retrain_log_finish(log_id: int, status: str, msg: str = ""):
             """, (status, msg[:255], log_id))
         conn.commit()
 
-def run_retrain_with_logging():
+def _load_retrain_state() -> Optional[Dict[str, object]]:
+    """
+    new_model 옆의 워터마크(마지막 성공 재학습까지 읽은 newtrain_table 기본 키)와 replay 표본을 읽는다.
+    예전 형식(행 수 워터마크)이나 키 없이 학습한 상태는 키로 옮길 수 없으므로 없는 것으로 보고 전체 재학습하게 한다.
+    """
+    if not (RETRAIN_STATE_PATH.exists() and REPLAY_PATH.exists()):
+        return None
+    if not ((NEW_MODEL_DIR / "normal_train.model").exists() and (NEW_MODEL_DIR / "scaler.joblib").exists()):
+        return None
+    with open(RETRAIN_STATE_PATH, encoding="utf-8") as f:
+        state = json.load(f)
+    if state.get("last_id") is None:
+        return None
+    state["replay"] = np.load(REPLAY_PATH)
+    return state
+
+
+def _update_replay(replay: np.ndarray, seen: int, new_rows: np.ndarray, seed: int) -> np.ndarray:
+    """저수지 샘플링으로 지금까지 본 모든 행에서 균등한 최대 REPLAY_SIZE개 표본을 유지한다."""
+    rng = np.random.default_rng(seed)
+    fill = max(min(REPLAY_SIZE - len(replay), len(new_rows)), 0)
+    replay = np.concatenate([replay, new_rows[:fill]]) if fill else replay.copy()
+    for i, row in enumerate(new_rows[fill:], start=seen + fill + 1):
+        j = rng.integers(i)
+        if j < REPLAY_SIZE:
+            replay[j] = row
+    return replay
+
+
+def _save_retrain_state(last_id: Optional[int], seen: int, replay: np.ndarray) -> None:
+    """워터마크(마지막으로 읽은 기본 키)와 replay 표본 저장 (아티팩트 저장이 끝난 뒤 호출)."""
+    np.save(REPLAY_PATH, replay)
+    tmp_path = RETRAIN_STATE_PATH.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"last_id": last_id, "seen": seen, "updated_at": time.strftime("%Y-%m-%d %H:%M:%S")}, f)
+    os.replace(tmp_path, RETRAIN_STATE_PATH)
+
+
+def _publish_artifacts(scaler_wrapper, model) -> None:
+    """임시 파일에 쓴 뒤 교체하고, 마지막으로 게시 표식을 갱신한다 (추론 쪽은 표식이 바뀔 때만 다시 로드)."""
+    import torch
+
+    NEW_MODEL_DIR.mkdir(parents=True, exist_ok=True)
+    scaler_path = NEW_MODEL_DIR / "scaler.joblib"
+    model_path = NEW_MODEL_DIR / "normal_train.model"
+    engine_path = NEW_MODEL_DIR / ENGINE_NAME
+    joblib.dump(scaler_wrapper, scaler_path.with_suffix(".tmp"))
+    torch.save(model.state_dict(), model_path.with_suffix(".tmp"))
+    # 엔진에는 교체될 모델/스케일러 파일 내용의 해시를 기록 (resolve_engine_path의 재변환 기준)
+    export_npz(
+        model, scaler_wrapper, engine_path.with_suffix(".tmp"), X_FILTER,
+        source=source_hash(model_path.with_suffix(".tmp"), scaler_path.with_suffix(".tmp")),
+    )
+    os.replace(scaler_path.with_suffix(".tmp"), scaler_path)
+    os.replace(model_path.with_suffix(".tmp"), model_path)
+    os.replace(engine_path.with_suffix(".tmp"), engine_path)
+    with open(PUBLISHED_PATH.with_suffix(".tmp"), "w", encoding="utf-8") as f:
+        json.dump({"published_at": time.strftime("%Y-%m-%d %H:%M:%S"), "pid": os.getpid()}, f)
+    os.replace(PUBLISHED_PATH.with_suffix(".tmp"), PUBLISHED_PATH)
+
+
+def _split_validation(log_id: int, feature_df: pd.DataFrame):
+    # 검증용 행을 떼어 두기 (행이 너무 적으면 검증 없이 학습)
+    perm = np.random.default_rng(SPLIT_SEED).permutation(len(feature_df))
+    n_val = int(len(feature_df) * VALIDATION_FRACTION) if len(feature_df) >= 10 else 0
+    train_df = feature_df.iloc[np.sort(perm[n_val:])]
+    val_df = feature_df.iloc[np.sort(perm[:n_val])]
+    _retrain_log_append(log_id, f"[재학습] 학습/검증 분할: train={len(train_df)}, val={len(val_df)}")
+    return train_df, val_df
+
+
+def _train_autoencoder(log_id: int, model, scaler_wrapper, train_df: pd.DataFrame, val_df: pd.DataFrame,
+                       num_epochs: int, learning_rate: float):
+    import torch
+    from auto_encoder.fast_train import earlyStopping, summarize_history, train_dataloader, train_in_memory
+
+    tensor_dataset = torch.tensor(scaler_wrapper.scaling(train_df), dtype=torch.float32)
+    val_tensor = torch.tensor(scaler_wrapper.scaling(val_df), dtype=torch.float32) if len(val_df) else None
+    stopper = earlyStopping(patience=EARLY_STOP_PATIENCE) if len(val_df) else None
+
+    log = lambda text: _retrain_log_append(log_id, f"[재학습] {text}")
+    if TRAIN_MODE == "tensor":
+        history = train_in_memory(
+            model, tensor_dataset, num_epochs, batch_size=FAST_BATCH_SIZE,
+            base_lr=learning_rate, base_batch_size=BATCH_SIZE, device=_device(), log=log,
+            val_data=val_tensor, early_stopping=stopper,
+        )
+    else:
+        history = train_dataloader(
+            model, tensor_dataset, num_epochs, batch_size=BATCH_SIZE, lr=learning_rate, device=_device(), log=log,
+            val_data=val_tensor, early_stopping=stopper,
+        )
+    _retrain_log_append(log_id, f"{summarize_history(history)} (mode={TRAIN_MODE})")
+    if stopper is not None:
+        _retrain_log_append(
+            log_id,
+            f"[재학습] best_epoch={stopper.best_epoch}, best_val_loss={stopper.best_loss:.6f}, "
+            f"stop_epoch={stopper.stopped_epoch}/{num_epochs}, early_stopped={stopper.stopped_early}"
+        )
+    return model
+
+
+def run_retrain_with_logging(mode: Optional[str] = None):
+    """
+    newtrain_table로 AutoEncoder를 재학습하고 new_model에 저장한다.
+    - full: 전체 행으로 스케일러/모델을 새로 학습
+    - incremental: 현재 new_model 가중치에서 시작해 워터마크 이후 행 + 과거 replay 표본으로 이어서 학습,
+      스케일러 통계는 새 행으로만 partial_fit (워터마크/replay가 없으면 full로 수행)
+    """
+    import torch
+    from auto_encoder.make_torch import stdScaling
+    from auto_encoder.model import AutoEncoder, autoencoder_from_state
+
+    mode = mode or RETRAIN_MODE
     log_id = _retrain_log_start()
     try:
-        _retrain_log_append(log_id, "[재학습] 시작")
-        feature_df = load_newtrain_features()
-        _retrain_log_append(log_id, f"[재학습] 데이터 로드 OK: shape={feature_df.shape}")
-
-        scaler_wrapper = stdScaling(feature_df)
-        scaled_array = scaler_wrapper.scaling(feature_df)
-        tensor_dataset = torch.tensor(scaled_array, dtype=torch.float32)
-        train_loader = DataLoader(tensor_dataset, batch_size=BATCH_SIZE, shuffle=True, num_workers=0, drop_last=False)
-
-        model = AutoEncoder(len(X_FILTER), HIDDEN_DIM, LATENT_DIM).to(DEVICE)
-        criterion = nn.MSELoss()
-        optimizer = optim.Adam(model.parameters(), lr=LEARNING_RATE)
-
-        for epoch in range(NUM_EPOCHS):
-            model.train()
-            epoch_loss = 0.0
-            for batch in train_loader:
-                batch = batch.to(DEVICE)
-                _, outputs = model(batch)
-                loss = criterion(outputs, batch)
-                optimizer.zero_grad(); loss.backward(); optimizer.step()
-                epoch_loss += loss.item() * batch.size(0)
-
-            epoch_loss /= len(train_loader.dataset)
-            if (epoch+1) % 10 == 0 or epoch == 0:
-                _retrain_log_append(log_id, f"[재학습] Epoch {epoch+1}/{NUM_EPOCHS}, Loss={epoch_loss:.6f}")
-
-        NEW_MODEL_DIR.mkdir(parents=True, exist_ok=True)
-        joblib.dump(scaler_wrapper, NEW_MODEL_DIR / "scaler.joblib")
-        torch.save(model.cpu().state_dict(), NEW_MODEL_DIR / "normal_train.model")
-        load_scaler.cache_clear(); load_model.cache_clear()
-
-        _retrain_log_append(log_id, "[재학습] 모델/스케일러 저장 완료")
+        _retrain_log_append(log_id, f"[재학습] 시작 (mode={mode})")
+        key = ensure_newtrain_key()
+        state = _load_retrain_state() if mode == "incremental" and key is not None else None
+        if mode == "incremental" and key is None:
+            _retrain_log_append(log_id, "[재학습] newtrain_table에 auto-increment 키가 없어 전체 재학습으로 진행")
+        elif mode == "incremental" and state is None:
+            _retrain_log_append(log_id, "[재학습] 워터마크/기존 모델이 없어 전체 재학습으로 진행")
+
+        if state is None:
+            feature_df = load_newtrain_features(key=key)
+            _retrain_log_append(log_id, f"[재학습] 데이터 로드 OK: shape={feature_df.shape}")
+            watermark = feature_df.attrs["last_id"]
+            new_rows = feature_df[X_FILTER].to_numpy(dtype=np.float64)
+            replay, seen = np.empty((0, len(X_FILTER))), 0
+
+            train_df, val_df = _split_validation(log_id, feature_df)
+            scaler_wrapper = stdScaling(train_df)
+            model = AutoEncoder(len(X_FILTER), HIDDEN_DIM, LATENT_DIM).to(_device())
+            _train_autoencoder(log_id, model, scaler_wrapper, train_df, val_df, NUM_EPOCHS, LEARNING_RATE)
+        else:
+            try:
+                new_df = load_newtrain_features(after_id=int(state["last_id"]), key=key)
+            except NoNewRowsError as exc:
+                _retrain_log_append(log_id, f"[재학습] {exc} → 건너뜀")
+                _retrain_log_finish(log_id, "success", "no new rows")
+                return
+            watermark = new_df.attrs["last_id"]
+            new_rows = new_df[X_FILTER].to_numpy(dtype=np.float64)
+            replay, seen = state["replay"], int(state["seen"])
+            replay_df = pd.DataFrame(replay, columns=X_FILTER)
+            _retrain_log_append(
+                log_id,
+                f"[재학습] 증분 데이터 로드 OK: new={len(new_df)} (last_id {state['last_id']}→{watermark}), replay={len(replay_df)}"
+            )
+
+            # 현재 스케일러 통계에 새 행만 누적
+            scaler_wrapper = joblib.load(NEW_MODEL_DIR / "scaler.joblib")
+            scaler_wrapper.scaler.partial_fit(new_df[X_FILTER])
+            model = autoencoder_from_state(torch.load(NEW_MODEL_DIR / "normal_train.model", map_location=_device()))
+            model.to(_device())
+
+            train_df, val_df = _split_validation(log_id, pd.concat([new_df[X_FILTER], replay_df], ignore_index=True))
+            _train_autoencoder(log_id, model, scaler_wrapper, train_df, val_df, FINETUNE_EPOCHS, LEARNING_RATE * FINETUNE_LR_RATIO)
+
+        _publish_artifacts(scaler_wrapper, model.cpu())
+        _save_retrain_state(watermark, seen + len(new_rows), _update_replay(replay, seen, new_rows, SPLIT_SEED + seen))
+        load_engine.cache_clear(); load_scaler.cache_clear(); load_model.cache_clear()
+
+        _retrain_log_append(log_id, f"[재학습] 모델/스케일러 저장 완료 (last_id={watermark})")
         _retrain_log_finish(log_id, "success", "ok")
     except Exception as e:
         _retrain_log_append(log_id, f"[에러] {repr(e)}", "ERROR")
         _retrain_log_finish(log_id, "failed", str(e))
         raise
 
+# === 재학습 워커 프로세스 (추론 루프/API 프로세스와 분리) ===
+_retrain_proc: Optional[subprocess.Popen] = None  # 이 프로세스가 띄운 마지막 재학습 워커
+_retrain_proc_lock = threading.Lock()
+_lock_file = None  # 이 프로세스가 잡고 있는 재학습 잠금 파일 (워커가 끝날 때까지 열어 둠)
+
+
+def _lock_owner() -> Optional[int]:
+    """잠금 파일에 기록된 소유 PID (확인용 정보, 실제 소유 여부는 flock으로 판단). 없거나 비어 있으면 None."""
+    try:
+        text = RETRAIN_LOCK_PATH.read_text().strip()
+    except FileNotFoundError:
+        return None
+    return int(text) if text.isdigit() else None
+
+
+def _acquire_retrain_lock() -> bool:
+    """
+    단일 실행 잠금: 잠금 파일에 fcntl.flock(LOCK_EX)을 걸고 워커가 끝날 때까지 파일을 열어 둔다.
+    잠금은 커널이 관리하므로 소유 프로세스가 죽으면 바로 풀리고, 남은 잠금을 회수하다 두 워커가
+    함께 잠금을 잡는 경쟁이 없다. 파일 내용(PID)은 확인용으로만 기록한다.
+    """
+    global _lock_file
+    NEW_MODEL_DIR.mkdir(parents=True, exist_ok=True)
+    f = open(RETRAIN_LOCK_PATH, "a+")  # 잠금을 잡기 전에는 내용을 지우지 않도록 append 모드로 연다
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        f.close()
+        return False
+    f.seek(0)
+    f.truncate()
+    f.write(str(os.getpid()))
+    f.flush()
+    _lock_file = f
+    return True
+
+
+def _release_retrain_lock() -> None:
+    global _lock_file
+    if _lock_file is None:
+        return
+    _lock_file.truncate(0)
+    fcntl.flock(_lock_file, fcntl.LOCK_UN)
+    _lock_file.close()
+    _lock_file = None
+
+
+def _lock_held() -> bool:
+    """다른 프로세스가 재학습 잠금을 잡고 있는지 공유 잠금을 시도해 확인 (잡히면 바로 푼다)."""
+    try:
+        f = open(RETRAIN_LOCK_PATH)
+    except FileNotFoundError:
+        return False
+    with f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        fcntl.flock(f, fcntl.LOCK_UN)
+        return False
+
+
+def retrain_running() -> bool:
+    if _retrain_proc is not None and _retrain_proc.poll() is None:
+        return True
+    return _lock_file is not None or _lock_held()
+
+
+def _consume_pending() -> bool:
+    try:
+        RETRAIN_PENDING_PATH.unlink()
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _request_pending() -> bool:
+    """
+    실행 중인 워커에 재학습 요청을 남긴다. 표시를 먼저 남기고 실행 여부를 다시 확인하므로,
+    워커가 잠금을 푼 뒤 마지막 확인까지 마친 경우에는 False를 돌려 호출자가 직접 실행하게 한다.
+    """
+    NEW_MODEL_DIR.mkdir(parents=True, exist_ok=True)
+    RETRAIN_PENDING_PATH.touch()
+    return retrain_running()
+
+
+def trigger_retrain_async(mode: Optional[str] = None) -> str:
+    """
+    재학습을 CPU 스레드 수를 제한한 별도 프로세스로 시작하고 바로 반환한다.
+    이미 실행 중이면 새 프로세스를 띄우지 않고 '대기 요청'으로 합쳐, 현재 실행이 끝난 뒤 한 번 더 수행한다.
+    자식 프로세스는 대기 스레드가 종료를 기다려 회수하므로 서버에 좀비 프로세스가 남지 않는다.
+
+    Returns
+    -------
+    "started" | "merged"
+    """
+    global _retrain_proc
+
+    with _retrain_proc_lock:
+        if retrain_running() and _request_pending():
+            return "merged"
+
+        env = dict(os.environ)
+        for key in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+            env[key] = str(RETRAIN_THREADS)
+        cmd = [sys.executable, str(Path(__file__).resolve()), "--retrain"]
+        if mode:
+            cmd.append(mode)
+        _retrain_proc = subprocess.Popen(cmd, cwd=str(ROOT_DIR), env=env, stdin=subprocess.DEVNULL, start_new_session=True)
+        threading.Thread(target=_retrain_proc.wait, name="retrain-reaper", daemon=True).start()
+        return "started"
+
+
+def retrain_worker_main(mode: Optional[str] = None) -> int:
+    """
+    재학습 워커 프로세스 진입점: 잠금을 잡은 동안 재학습을 수행하고, 실행 중 들어온 요청은 한 번 더 수행해 합친다.
+    대기 표시는 잠금을 잡은 워커만 지우므로, 잠금을 푼 뒤에 남은 표시는 다시 잠금을 잡아 처리한다.
+    """
+    import torch
+
+    torch.set_num_threads(RETRAIN_THREADS)
+    if hasattr(os, "nice"):
+        os.nice(10)  # 추론 루프보다 낮은 우선순위
+
+    status = 0
+    while True:
+        if not _acquire_retrain_lock():
+            # 다른 워커가 실행 중(또는 잠금 확인 중): 요청을 넘기고, 그 사이 잠금이 풀렸으면 직접 잠금을 잡는다
+            if _request_pending():
+                return status
+            continue
+        try:
+            while True:
+                _consume_pending()
+                try:
+                    run_retrain_with_logging(mode)
+                except Exception as exc:
+                    print(f"[재학습 워커] 실패: {exc}")
+                    status = 1
+                if not RETRAIN_PENDING_PATH.exists():
+                    break
+        finally:
+            _release_retrain_lock()
+        # 잠금 해제 직전에 들어온 요청이 있으면 다시 잠금을 잡고 처리
+        if not RETRAIN_PENDING_PATH.exists():
+            return status
+
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--retrain":
+        sys.exit(retrain_worker_main(sys.argv[2] if len(sys.argv) > 2 else None))
     debug_db_snapshot()
     main_loop()
\ No newline at end of file
@@ -35,9 +35,9 @@ from anomaly_pipeline import (
     fetch_realtime_row_by_offset,
     run_autoencoder_inference,
     insert_ai_result,
-    retrain_autoencoder_from_newtrain,
-    load_model,
-    load_scaler,
+    trigger_retrain_async,
+    retrain_running,
+    load_engine,
 )
 
 app = FastAPI(title="PMS Anomaly API", version="1.0.0")
@@ -96,9 +96,8 @@ def _get_realtime_count() -> int:
 # ---- 앱 라이프사이클 ----
 @app.on_event("startup")
 def _warmup():
-    # 모델/스케일러 미리 로드 & DB 헬스체크
-    load_model()
-    load_scaler()
+    # 추론 엔진(NumPy) 미리 로드 & DB 헬스체크
+    load_engine()
     try:
         _ = _get_realtime_count()
     except Exception as e:
@@ -175,11 +174,15 @@ def infer_latest():
         threshold=50.0,
     )
 
-@app.post("/retrain", summary="newtrain_table 기반 재학습(백그라운드)")
-def retrain(background: BackgroundTasks):
-    # 오래 걸리므로 비동기 백그라운드로
-    background.add_task(retrain_autoencoder_from_newtrain)
-    return {"status": "queued"}
+@app.post("/retrain", summary="newtrain_table 기반 재학습(별도 프로세스)")
+def retrain():
+    # API 프로세스와 GIL/CPU를 다투지 않도록 스레드 수를 제한한 워커 프로세스에서 실행
+    # 이미 실행 중이면 새로 띄우지 않고 끝난 뒤 한 번 더 수행하도록 합침 (status=merged)
+    return {"status": trigger_retrain_async()}
+
+@app.get("/retrain/status", summary="재학습 워커 실행 여부")
+def retrain_status():
+    return {"running": retrain_running()}
 
 @app.get("/ai-result/latest", summary="최근 AI 판정 N개 조회")
 def get_ai_results(n: int = Query(20, ge=1, le=200)):